@@ -1,11 +1,169 @@
 """Binance API client with authentication and rate limiting."""
-import hashlib
+import asyncio
+import atexit
 import hmac
+import json
+import logging
+import random
+import ssl
+import threading
 import time
-from typing import Dict, Any, Optional
-from urllib.parse import urlencode
+from typing import Dict, Any, Optional, List, Tuple, Callable
+import certifi
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# httpx only decodes brotli responses when a brotli package is installed
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "gzip, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip"
+
+
+# Endpoints whose responses carry a meaningful X-MBX-USED-WEIGHT-1M header
+WEIGHT_TRACKED_ENDPOINTS = frozenset({
+    "/sapi/v1/fiat/orders",
+    "/sapi/v1/fiat/payments",
+    "/api/v3/account",
+})
+
+
+class _WeightThrottle:
+    """Shared pause for all requests once Binance reports high request weight.
+    
+    When a response reports more than ``threshold`` weight used in the current
+    minute, every caller (sync or async, any thread) waits until ``cooldown``
+    seconds after the latest such report before sending its next request.
+    """
+    
+    def __init__(self, threshold: int = 800, cooldown: float = 5.0):
+        self.threshold = threshold  # 80% of 1000 limit
+        self.cooldown = cooldown
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+    
+    def record(self, weight_used: int):
+        """Register the weight reported by a response."""
+        if weight_used > self.threshold:
+            logger.warning("High API weight usage: %d/1000", weight_used)
+            with self._lock:
+                self._resume_at = max(self._resume_at, time.monotonic() + self.cooldown)
+    
+    def delay(self) -> float:
+        """Seconds to wait before the next request may be sent."""
+        with self._lock:
+            return max(0.0, self._resume_at - time.monotonic())
+    
+    def wait(self):
+        """Block the calling thread until requests may resume."""
+        delay = self.delay()
+        if delay:
+            time.sleep(delay)
+    
+    async def async_wait(self):
+        """Suspend the calling task until requests may resume."""
+        delay = self.delay()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+_WEIGHT_THROTTLE = _WeightThrottle()
+
+
+def _track_weight(response: httpx.Response):
+    """httpx response hook feeding request weight into the shared throttle."""
+    if response.request.url.path in WEIGHT_TRACKED_ENDPOINTS:
+        _WEIGHT_THROTTLE.record(int(response.headers.get('X-MBX-USED-WEIGHT-1M') or 0))
+
+
+async def _async_track_weight(response: httpx.Response):
+    """AsyncClient variant of :func:`_track_weight`."""
+    _track_weight(response)
+
+
+USER_AGENT = "binance-fiat/1.0"
+
+# Built once so each client doesn't re-parse the CA bundle
+_SSL_CONTEXT = ssl.create_default_context(cafile=certifi.where())
+_SSL_CONTEXT.set_alpn_protocols(["h2", "http/1.1"])
+
+# Process-wide sync client so TCP/TLS/HTTP2 connections survive across client instances.
+# The API key is sent per request because instances may belong to different accounts.
+_SHARED_CLIENT: Optional[httpx.Client] = None
+_SHARED_CLIENT_LOCK = threading.Lock()
+
+
+def _get_shared_client() -> httpx.Client:
+    """Return the shared httpx client, creating it if needed."""
+    global _SHARED_CLIENT
+    with _SHARED_CLIENT_LOCK:
+        client = _SHARED_CLIENT
+        if client is not None and not client.is_closed:
+            return client
+        client = _SHARED_CLIENT = httpx.Client(
+            timeout=30.0,
+            http2=True,
+            verify=_SSL_CONTEXT,
+            headers={"Accept-Encoding": _ACCEPT_ENCODING, "User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=300),
+            event_hooks={"response": [_track_weight]}
+        )
+    
+    # Only the creating thread warms up, outside the lock so other threads and atexit never wait on it
+    _warm_up(client)
+    return client
+
+
+def _warm_up(client: httpx.Client):
+    """Open the connection with a cheap ping so the first real request skips setup.
+    
+    This also seeds the HTTP/2 HPACK table with the session headers.
+    """
+    try:
+        client.head(f"{BinanceAPIClient.BASE_URL}/api/v3/ping", timeout=10)
+    except httpx.HTTPError as e:
+        logger.debug("Connection warm-up failed: %s", e)
+
+
+@atexit.register
+def _close_shared_client():
+    """Close the shared httpx client on interpreter exit."""
+    global _SHARED_CLIENT
+    with _SHARED_CLIENT_LOCK:
+        if _SHARED_CLIENT is not None:
+            _SHARED_CLIENT.close()
+            _SHARED_CLIENT = None
+
+
+# Last successful clock sync as (monotonic time, offset ms); reused while fresh
+_LAST_SYNC: Optional[Tuple[float, int]] = None
+SYNC_REUSE_SECONDS = 300
+
+
+def _fast_query_string(params: Dict[str, Any]) -> str:
+    """Encode signed request parameters without URL quoting.
+    
+    Binance signed parameters (transactionType, page, rows, beginTime, endTime,
+    timestamp, recvWindow) are all plain digits, so quoting is a no-op for them.
+    """
+    assert all(
+        not any(c in str(v) for c in "&=%+ #?") for v in params.values()
+    ), f"Signed parameter needs URL quoting: {params}"
+    return "&".join(f"{key}={value}" for key, value in params.items())
+
+
+def _loads(content: bytes) -> Any:
+    """Decode a JSON response body, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
 
 
 class BinanceAPIClient:
@@ -13,115 +171,277 @@ class BinanceAPIClient:
     
     BASE_URL = "https://api.binance.com"
     
+    # Cap on in-flight HTTP/2 streams, kept below Binance's SETTINGS_MAX_CONCURRENT_STREAMS
+    MAX_CONCURRENT_STREAMS = 20
+    
+    # Freshness windows (seconds) for cached public endpoints
+    PRICES_CACHE_TTL = 10.0
+    SERVER_TIME_CACHE_TTL = 60.0
+    
+    # Max age (ms) Binance accepts for a signed request's timestamp
+    RECV_WINDOW_MS = 60000
+    
+    # HTTP status codes that map to a specific error category
+    HTTP_ERROR_KINDS = {
+        429: 'rate_limited',
+        418: 'rate_limited',  # IP banned after repeated rate limit violations
+        401: 'auth',
+        403: 'auth',
+    }
+    
+    # Network error retries: exponential backoff from 100ms capped at 10s, plus random jitter
+    MAX_NETWORK_ATTEMPTS = 5
+    RETRY_BASE_DELAY = 0.1
+    RETRY_MAX_DELAY = 10.0
+    RETRY_JITTER = 0.5
+    
     def __init__(self, api_key: str, api_secret: str):
         """Initialize client with API credentials."""
         self.api_key = api_key
         self.api_secret = api_secret
+        # Encoded once; signing runs entirely in C via the one-shot hmac.digest()
+        self._key_bytes = api_secret.encode('utf-8')
+        self._auth_headers = {"X-MBX-APIKEY": api_key}
         self.session = None
+        self._get = None  # Bound session.get/session.post, set on connect
+        self._post = None
+        self.async_session = None
+        self._stream_semaphore = None
         self._ts_offset = 0  # Time offset from server
+        self._cache: Dict[str, Tuple[float, Any]] = {}  # key -> (monotonic time stored, value)
     
     def __enter__(self):
-        self.session = httpx.Client(
-            timeout=30.0,
-            http2=True,
-            headers={"X-MBX-APIKEY": self.api_key}
-        )
+        self.session = _get_shared_client()
+        self._get = self.session.get
+        self._post = self.session.post
         # Sync time with server on connect
         self._sync_server_time()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
+        # The shared session stays open for reuse; it is closed at exit
         if self.session:
-            self.session.close()
             self.session = None
+            self._get = None
+            self._post = None
+    
+    async def __aenter__(self):
+        self.async_session = httpx.AsyncClient(
+            timeout=30.0,
+            http2=True,
+            verify=_SSL_CONTEXT,
+            headers={
+                "X-MBX-APIKEY": self.api_key,
+                "Accept-Encoding": _ACCEPT_ENCODING,
+                "User-Agent": USER_AGENT
+            },
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4, keepalive_expiry=60),
+            event_hooks={"response": [_async_track_weight]}
+        )
+        self._stream_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_STREAMS)
+        # Sync time with server on connect
+        await self._async_sync_server_time()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.async_session:
+            await self.async_session.aclose()
+            self.async_session = None
+            self._stream_semaphore = None
+    
+    def _sign_query_string(self, query_string: str) -> str:
+        """Generate HMAC SHA256 signature for an already-encoded query string."""
+        return hmac.digest(self._key_bytes, query_string.encode('utf-8'), 'sha256').hex()
+    
+    def _reuse_recent_sync(self) -> bool:
+        """Adopt the offset from a sync made in the last few minutes, if any."""
+        if _LAST_SYNC and time.monotonic() - _LAST_SYNC[0] < SYNC_REUSE_SECONDS:
+            self._ts_offset = _LAST_SYNC[1]
+            return True
+        return False
     
-    def _generate_signature(self, params: Dict[str, Any]) -> str:
-        """Generate HMAC SHA256 signature for authenticated requests."""
-        query_string = urlencode(params)
-        return hmac.new(
-            self.api_secret.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+    def _record_sync(self, server_time: int):
+        """Store the offset between server and local clock."""
+        global _LAST_SYNC
+        client_time = time.time_ns() // 1_000_000
+        self._ts_offset = server_time - client_time
+        _LAST_SYNC = (time.monotonic(), self._ts_offset)
+        logger.debug("Time sync: server=%d, client=%d, offset=%dms", server_time, client_time, self._ts_offset)
     
     def _sync_server_time(self):
         """Synchronize with server time to avoid timestamp errors."""
+        if self._reuse_recent_sync():
+            return
         try:
             response = self.session.get(f"{self.BASE_URL}/api/v3/time", timeout=10)
             response.raise_for_status()
-            server_time = response.json()["serverTime"]
-            client_time = int(time.time() * 1000)
-            self._ts_offset = server_time - client_time
-            print(f"Time sync: server={server_time}, client={client_time}, offset={self._ts_offset}ms")
+            self._record_sync(_loads(response.content)["serverTime"])
         except Exception as e:
-            print(f"Warning: Failed to sync server time: {e}")
+            logger.warning("Failed to sync server time: %s", e)
+            self._ts_offset = 0
+    
+    async def _async_sync_server_time(self):
+        """Synchronize with server time using the async session."""
+        if self._reuse_recent_sync():
+            return
+        try:
+            response = await self.async_session.get(f"{self.BASE_URL}/api/v3/time", timeout=10)
+            response.raise_for_status()
+            self._record_sync(_loads(response.content)["serverTime"])
+        except Exception as e:
+            logger.warning("Failed to sync server time: %s", e)
             self._ts_offset = 0
     
     def _add_timestamp(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Add timestamp and recvWindow to parameters."""
-        params = params.copy()
-        # Use server-synchronized timestamp
-        params['timestamp'] = int(time.time() * 1000) + self._ts_offset
-        # Add recvWindow to reduce timestamp drift errors
-        params['recvWindow'] = 60000
-        return params
+        """Return a new dict of parameters with timestamp and recvWindow added."""
+        return {
+            **params,
+            # Use server-synchronized timestamp
+            'timestamp': time.time_ns() // 1_000_000 + self._ts_offset,
+            # Add recvWindow to reduce timestamp drift errors
+            'recvWindow': self.RECV_WINDOW_MS,
+        }
     
-    def _make_request(
+    def _prepare_request(
         self, 
-        method: str, 
-        endpoint: str, 
-        params: Optional[Dict[str, Any]] = None,
-        signed: bool = False
-    ) -> Dict[str, Any]:
-        """Make HTTP request to Binance API."""
-        url = f"{self.BASE_URL}{endpoint}"
-        headers = {"X-MBX-APIKEY": self.api_key}
+        url: str, 
+        params: Optional[Dict[str, Any]], 
+        signed: bool
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Return the request URL and parameters, timestamped and signed when required.
         
+        Signed requests are encoded exactly once: the signed query string is
+        appended to the URL so httpx cannot re-serialize it differently.
+        """
         if params is None:
             params = {}
         
         if signed:
-            params = self._add_timestamp(params)
-            params['signature'] = self._generate_signature(params)
+            query_string = _fast_query_string(self._add_timestamp(params))
+            signature = self._sign_query_string(query_string)
+            return f"{url}?{query_string}&signature={signature}", None
         
+        return url, params
+    
+    def _handle_response(self, response: httpx.Response) -> Dict[str, Any]:
+        """Decode a successful response or raise for an HTTP error status."""
+        response.raise_for_status()
+        return _loads(response.content) if response.content else {}
+    
+    def _retry_delay(self, attempt: int) -> float:
+        """Backoff before retrying after failed attempt number ``attempt`` (1-based)."""
+        delay = min(self.RETRY_BASE_DELAY * (2 ** (attempt - 1)), self.RETRY_MAX_DELAY)
+        return delay + random.uniform(0, self.RETRY_JITTER)
+    
+    def _parse_error_msg(self, response: httpx.Response) -> Optional[str]:
+        """Decode the ``msg`` field of an error response body once, if present."""
         try:
-            if method.upper() == "GET":
-                response = self.session.get(url, params=params, headers=headers)
-            elif method.upper() == "POST":
-                response = self.session.post(url, data=params, headers=headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            # Check for rate limit warnings in headers
-            weight_used = response.headers.get('X-MBX-USED-WEIGHT-1M')
-            if weight_used and int(weight_used) > 800:  # 80% of 1000 limit
-                print(f"Warning: High API weight usage: {weight_used}/1000")
-                time.sleep(5)  # Preventive sleep
-            
-            response.raise_for_status()
-            return response.json()
+            error_data = _loads(response.content) if response.content else {}
+        except ValueError:
+            return None
+        return error_data.get('msg') if isinstance(error_data, dict) else None
+    
+    def _translate_error(self, e: Exception) -> Exception:
+        """Convert an httpx or unexpected error into the client's error message format."""
+        if isinstance(e, httpx.HTTPStatusError):
+            status = e.response.status_code
+            kind = self.HTTP_ERROR_KINDS.get(status)
+            error_msg = self._parse_error_msg(e.response)
             
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code in (429, 418):
+            if kind == 'rate_limited':
                 # Rate limit exceeded (429) or I'm a teapot (418 = IP banned)
                 retry_after = e.response.headers.get('Retry-After', '60')
-                error_data = e.response.json() if e.response.content else {}
-                error_msg = error_data.get('msg', f'Rate limited (HTTP {e.response.status_code})')
-                raise Exception(f"rate_limited: {error_msg} (retry after {retry_after}s)")
-            elif e.response.status_code in (401, 403):
-                # Authentication error
-                error_data = e.response.json() if e.response.content else {}
-                error_msg = error_data.get('msg', 'Authentication failed')
-                raise Exception(f"Authentication failed: {error_msg}")
-            else:
-                # Other HTTP error
-                error_data = e.response.json() if e.response.content else {}
-                error_msg = error_data.get('msg', f'HTTP {e.response.status_code} error')
-                raise Exception(f"API request failed: {error_msg}")
-        except httpx.RequestError as e:
-            raise Exception(f"Network error: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Unexpected error: {str(e)}")
+                error_msg = error_msg or f'Rate limited (HTTP {status})'
+                return Exception(f"rate_limited: {error_msg} (retry after {retry_after}s)")
+            if kind == 'auth':
+                return Exception(f"Authentication failed: {error_msg or 'Authentication failed'}")
+            return Exception(f"API request failed: {error_msg or f'HTTP {status} error'}")
+        if isinstance(e, httpx.RequestError):
+            return Exception(f"Network error: {str(e)}")
+        return Exception(f"Unexpected error: {str(e)}")
+    
+    def _make_request(
+        self, 
+        method: str, 
+        endpoint: str, 
+        params: Optional[Dict[str, Any]] = None,
+        signed: bool = False
+    ) -> Dict[str, Any]:
+        """Make HTTP request to Binance API."""
+        for attempt in range(1, self.MAX_NETWORK_ATTEMPTS + 1):
+            try:
+                _WEIGHT_THROTTLE.wait()
+                # Sign on every attempt so retries carry a fresh timestamp within recvWindow
+                url, request_params = self._prepare_request(f"{self.BASE_URL}{endpoint}", params, signed)
+                if method.upper() == "GET":
+                    response = self._get(url, params=request_params, headers=self._auth_headers)
+                elif method.upper() == "POST":
+                    response = self._post(url, data=request_params, headers=self._auth_headers)
+                else:
+                    raise ValueError(f"Unsupported HTTP method: {method}")
+                
+                return self._handle_response(response)
+                
+            except httpx.RequestError as e:
+                if attempt < self.MAX_NETWORK_ATTEMPTS:
+                    time.sleep(self._retry_delay(attempt))
+                    continue
+                raise self._translate_error(e)
+            except Exception as e:
+                raise self._translate_error(e)
+    
+    async def _async_request(
+        self, 
+        method: str, 
+        endpoint: str, 
+        params: Optional[Dict[str, Any]] = None,
+        signed: bool = False
+    ) -> Dict[str, Any]:
+        """Make HTTP request to Binance API as a multiplexed HTTP/2 stream."""
+        for attempt in range(1, self.MAX_NETWORK_ATTEMPTS + 1):
+            try:
+                await _WEIGHT_THROTTLE.async_wait()
+                async with self._stream_semaphore:
+                    # Sign inside the semaphore so queued requests get a fresh timestamp
+                    url, request_params = self._prepare_request(f"{self.BASE_URL}{endpoint}", params, signed)
+                    if method.upper() == "GET":
+                        response = await self.async_session.get(url, params=request_params)
+                    elif method.upper() == "POST":
+                        response = await self.async_session.post(url, data=request_params)
+                    else:
+                        raise ValueError(f"Unsupported HTTP method: {method}")
+                
+                return self._handle_response(response)
+                
+            except httpx.RequestError as e:
+                if attempt < self.MAX_NETWORK_ATTEMPTS:
+                    await asyncio.sleep(self._retry_delay(attempt))
+                    continue
+                raise self._translate_error(e)
+            except Exception as e:
+                raise self._translate_error(e)
+    
+    def _fiat_params(
+        self,
+        transaction_type: str,
+        begin_time: Optional[int],
+        end_time: Optional[int],
+        page: int,
+        rows: int
+    ) -> Dict[str, Any]:
+        """Build query parameters shared by the fiat history endpoints."""
+        params = {
+            "transactionType": transaction_type,
+            "page": page,
+            "rows": rows
+        }
+        
+        if begin_time:
+            params["beginTime"] = begin_time
+        if end_time:
+            params["endTime"] = end_time
+        
+        return params
     
     def get_fiat_orders(
         self, 
@@ -140,17 +460,7 @@ class BinanceAPIClient:
             page: Page number (starts from 1)
             rows: Number of records per page (max 500)
         """
-        params = {
-            "transactionType": transaction_type,
-            "page": page,
-            "rows": rows
-        }
-        
-        if begin_time:
-            params["beginTime"] = begin_time
-        if end_time:
-            params["endTime"] = end_time
-        
+        params = self._fiat_params(transaction_type, begin_time, end_time, page, rows)
         return self._make_request("GET", "/sapi/v1/fiat/orders", params, signed=True)
     
     def get_fiat_payments(
@@ -170,40 +480,103 @@ class BinanceAPIClient:
             page: Page number (starts from 1)
             rows: Number of records per page (max 500)
         """
-        params = {
-            "transactionType": transaction_type,
-            "page": page,
-            "rows": rows
-        }
+        params = self._fiat_params(transaction_type, begin_time, end_time, page, rows)
+        return self._make_request("GET", "/sapi/v1/fiat/payments", params, signed=True)
+    
+    async def aget_fiat_orders(
+        self,
+        pages: List[int],
+        transaction_type: str = "0",
+        begin_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        rows: int = 500
+    ) -> List[Dict[str, Any]]:
+        """Fetch several pages of fiat order history concurrently.
         
-        if begin_time:
-            params["beginTime"] = begin_time
-        if end_time:
-            params["endTime"] = end_time
+        Must be used inside ``async with BinanceAPIClient(...)``. Responses are
+        returned in the same order as ``pages``.
+        """
+        return await self._gather_pages("/sapi/v1/fiat/orders", pages, transaction_type, begin_time, end_time, rows)
+    
+    async def aget_fiat_payments(
+        self,
+        pages: List[int],
+        transaction_type: str = "0",
+        begin_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        rows: int = 500
+    ) -> List[Dict[str, Any]]:
+        """Fetch several pages of fiat payment history concurrently.
         
-        return self._make_request("GET", "/sapi/v1/fiat/payments", params, signed=True)
+        Must be used inside ``async with BinanceAPIClient(...)``. Responses are
+        returned in the same order as ``pages``.
+        """
+        return await self._gather_pages("/sapi/v1/fiat/payments", pages, transaction_type, begin_time, end_time, rows)
+    
+    async def _gather_pages(
+        self,
+        endpoint: str,
+        pages: List[int],
+        transaction_type: str,
+        begin_time: Optional[int],
+        end_time: Optional[int],
+        rows: int
+    ) -> List[Dict[str, Any]]:
+        """Issue one signed request per page and await them together."""
+        param_list = [
+            self._fiat_params(transaction_type, begin_time, end_time, page, rows)
+            for page in pages
+        ]
+        return await asyncio.gather(
+            *[self._async_request("GET", endpoint, params, signed=True) for params in param_list]
+        )
     
     def get_account_info(self) -> Dict[str, Any]:
         """Get account information including spot balances."""
         return self._make_request("GET", "/api/v3/account", signed=True)
     
+    def _cached_request(self, key: str, ttl: float, loader: Callable[[], Any]) -> Any:
+        """Return a cached value younger than ``ttl`` seconds, otherwise call ``loader``.
+        
+        If ``loader`` fails and a stale value exists, the stale value is returned
+        so a transient error (e.g. rate limiting) doesn't abort the caller.
+        """
+        cached = self._cache.get(key)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        
+        try:
+            value = loader()
+        except Exception as e:
+            if cached is None:
+                raise
+            logger.warning("Using stale %s data after request failure: %s", key, e)
+            return cached[1]
+        
+        self._cache[key] = (time.monotonic(), value)
+        return value
+    
     def get_all_prices(self) -> Dict[str, float]:
         """Get current prices for all symbols."""
+        return self._cached_request("/api/v3/ticker/price", self.PRICES_CACHE_TTL, self._load_all_prices)
+    
+    def _load_all_prices(self) -> Dict[str, float]:
+        """Fetch all ticker prices from the API."""
         response = self._make_request("GET", "/api/v3/ticker/price")
         
         # Convert list of dicts to dict of symbol -> price
-        price_dict = {}
-        for item in response:
-            symbol = item['symbol']
-            price = float(item['price'])
-            price_dict[symbol] = price
-        
-        return price_dict
+        return {item['symbol']: float(item['price']) for item in response}
     
     def get_server_time(self) -> int:
-        """Get server time for timestamp synchronization."""
+        """Get the current server time (ms) as the local clock plus the cached server offset."""
+        offset = self._cached_request("/api/v3/time", self.SERVER_TIME_CACHE_TTL, self._load_server_time_offset)
+        return time.time_ns() // 1_000_000 + offset
+    
+    def _load_server_time_offset(self) -> int:
+        """Fetch the server time and return its offset (ms) from the local clock."""
         response = self._make_request("GET", "/api/v3/time")
-        return response['serverTime']
+        self._record_sync(response['serverTime'])
+        return self._ts_offset
     
     def test_connection(self) -> bool:
         """Test API connection and credentials."""
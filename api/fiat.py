@@ -1,28 +1,157 @@
 """Fiat orders fetching with time-based chunking for historical data."""
+import asyncio
+import calendar
+import functools
 import time
 import json
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional, Tuple, Callable
+import logging
+import os
+import struct
+import sys
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Set, Tuple, Callable
 from pathlib import Path
+from types import MappingProxyType
+import numpy as np
 from .binance_client import BinanceAPIClient
+from .fx_rates import FxRateCache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Normalized field -> raw API keys to try in priority order, and the default if none are present.
+# The two fiat endpoints (and older payloads) name the same values differently.
+_FIELD_MAP = (
+    ('createTime', ('createTime', 'orderCreateTime'), 0),
+    ('updateTime', ('updateTime', 'orderUpdateTime'), 0),
+    ('status', ('status',), ''),
+    ('paymentMethod', ('method', 'paymentMethod'), ''),
+    ('orderId', ('orderNo', 'paymentId', 'orderId'), ''),
+    ('cryptoCurrency', ('cryptoCurrency', 'coin'), ''),
+)
+_FIAT_AMOUNT_KEYS = ('sourceAmount', 'amount', 'totalAmount', 'indicatedAmount')
+_CRYPTO_AMOUNT_KEYS = ('obtainAmount', 'cryptoAmount')
+_FEE_KEYS = ('totalFee', 'fee')
+
+# Lower-cased statuses of transactions that actually settled
+_OK_STATUS = frozenset(('completed', 'successful', 'finished'))
+
+
+# Approximate conversion rates to EUR, used when no historical ECB rate is available
+_FX_RATES = {
+    'USD': 0.85,    # 1 USD ≈ 0.85 EUR
+    'GBP': 1.15,    # 1 GBP ≈ 1.15 EUR
+    'CHF': 0.95,    # 1 CHF ≈ 0.95 EUR
+    'CAD': 0.65,    # 1 CAD ≈ 0.65 EUR
+    'AUD': 0.60,    # 1 AUD ≈ 0.60 EUR
+    'JPY': 0.0065,  # 1 JPY ≈ 0.0065 EUR
+    'CNY': 0.125,   # 1 CNY ≈ 0.125 EUR
+    'HRK': 0.133,   # 1 HRK ≈ 0.133 EUR (7.5 HRK = 1 EUR)
+    'SEK': 0.090,   # 1 SEK ≈ 0.090 EUR
+    'NOK': 0.085,   # 1 NOK ≈ 0.085 EUR
+    'PLN': 0.22,    # 1 PLN ≈ 0.22 EUR
+}
+# Read-only public view, plus the bound lookup used per record
+EUR_CONVERSION_RATES = MappingProxyType(_FX_RATES)
+_FX_RATES_GET = _FX_RATES.get
+
+# Dedup key layout: 5-minute bucket, fiat code, fiat cents, crypto code, crypto micro-units
+_DEDUP_KEY_STRUCT = struct.Struct('<qiqiq')
+
+
+# (start month, month after end) for each quarter; 13 rolls over to January of the next year
+_QUARTERS = ((1, 4), (4, 7), (7, 10), (10, 13))
+
+
+@functools.lru_cache(maxsize=8)
+def _quarter_windows(
+    start_year: int, 
+    end_year: int, 
+    current_year: int, 
+    current_quarter: int
+) -> Tuple[Tuple[int, int, int, int], ...]:
+    """Quarter windows as (begin_ms, end_ms, year, quarter) in UTC, excluding quarters after the current one.
+    
+    The current quarter is part of the cache key so results don't go stale when
+    the app stays open across a quarter boundary.
+    """
+    windows = []
+    for year in range(start_year, end_year + 1):
+        for quarter, (start_month, next_month) in enumerate(_QUARTERS, start=1):
+            # Don't fetch future quarters
+            if (year, quarter) > (current_year, current_quarter):
+                continue
+            
+            begin_time = calendar.timegm((year, start_month, 1, 0, 0, 0)) * 1000
+            if next_month == 13:
+                next_start = calendar.timegm((year + 1, 1, 1, 0, 0, 0)) * 1000
+            else:
+                next_start = calendar.timegm((year, next_month, 1, 0, 0, 0)) * 1000
+            windows.append((begin_time, next_start - 1, year, quarter))  # End is last millisecond of the quarter
+    
+    return tuple(windows)
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize JSON as UTF-8 bytes (compact, or 2-space indented), preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2) if indent else orjson.dumps(obj)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _pick(record: Dict[str, Any], keys: Tuple[str, ...], default: Any) -> Any:
+    """Return the value of the first key present in ``record``, else ``default``."""
+    for key in keys:
+        if key in record:
+            return record[key]
+    return default
 
 
 class FiatOrdersFetcher:
     """Handles fetching fiat orders with chunking and resume functionality."""
     
+    # Quarter windows paged in parallel; the client's weight throttle still gates each request
+    MAX_CONCURRENT_WINDOWS = 6
+    
     def __init__(
         self, 
         client: BinanceAPIClient, 
         db_manager, 
         exports_dir: Path,
-        sleep_seconds: float = 1.0
+        sleep_seconds: float = 1.0,
+        keep_original: bool = False
     ):
-        """Initialize fetcher with client and storage."""
+        """Initialize fetcher with client and storage.
+        
+        Set keep_original to store the raw API payload on each record as ``_original`` for debugging.
+        """
         self.client = client
         self.db_manager = db_manager
         self.exports_dir = exports_dir
         self.sleep_seconds = sleep_seconds
+        self.keep_original = keep_original
         self.progress_callback: Optional[Callable] = None
+        self._last_checkpoint: Optional[Tuple[int, int, int]] = None  # (year, quarter, page) last saved
+        self._checkpoint_file = exports_dir / "fetch_checkpoint.json"
+        self._checkpoint_temp_file = exports_dir / "fetch_checkpoint.json.tmp"
+        # In-memory copy of the checkpoint file once it has been read or written
+        self._checkpoint: Optional[Dict[str, Any]] = None
+        self._checkpoint_loaded = False
+        self.fx_rates = FxRateCache(db_manager.data_dir / "fx_rates.json")
+        self._next_ok = 0.0  # time.monotonic() at which the next API call may start
     
     def set_progress_callback(self, callback: Callable[[str, int, int], None]):
         """Set callback for progress updates."""
@@ -33,174 +162,160 @@ class FiatOrdersFetcher:
         if self.progress_callback:
             self.progress_callback(message, current, total)
     
-    def generate_quarter_windows(self, start_year: int, end_year: int) -> List[Tuple[int, int]]:
-        """Generate quarterly time windows for API calls (max 90-day spans).
+    async def _pace(self):
+        """Space API calls at least sleep_seconds apart across all concurrent windows.
         
-        Returns list of (begin_time, end_time) tuples in milliseconds.
+        Each caller reserves the next free slot before sleeping, so time already spent
+        waiting on a slow response counts towards the gap instead of adding to it.
         """
-        def ms(dt): 
-            return int(dt.replace(tzinfo=timezone.utc).timestamp() * 1000)
-        
-        def quarter_windows(year):
-            quarters = [(1,3), (4,6), (7,9), (10,12)]
-            for start_month, end_month in quarters:
-                start = datetime(year, start_month, 1, tzinfo=timezone.utc)
-                # End is last day of end_month
-                if end_month == 12:
-                    next_start = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
-                else:
-                    next_start = datetime(year, end_month + 1, 1, tzinfo=timezone.utc)
-                end = next_start - timedelta(milliseconds=1)
-                yield start, end
-        
-        windows = []
-        for year in range(start_year, end_year + 1):
-            for start_date, end_date in quarter_windows(year):
-                # Don't fetch future quarters
-                if start_date > datetime.now(timezone.utc):
-                    continue
-                    
-                begin_time = ms(start_date)
-                end_time = ms(end_date)
-                windows.append((begin_time, end_time))
+        now = time.monotonic()
+        start = max(now, self._next_ok)
+        self._next_ok = start + self.sleep_seconds
+        if start > now:
+            await asyncio.sleep(start - now)
+    
+    def generate_quarter_windows(self, start_year: int, end_year: int) -> List[Tuple[int, int, int, int]]:
+        """Generate quarterly time windows for API calls (max 90-day spans).
         
-        return windows
+        Returns list of (begin_time, end_time, year, quarter) tuples, times in milliseconds.
+        """
+        now = datetime.now(timezone.utc)
+        current_quarter = (now.month - 1) // 3 + 1
+        return list(_quarter_windows(start_year, end_year, now.year, current_quarter))
     
-    def _normalize_purchase(self, purchase: Dict[str, Any], trans_type: str, endpoint: str) -> Dict[str, Any]:
+    def _normalize_purchase(
+        self, 
+        purchase: Dict[str, Any], 
+        trans_type: str, 
+        endpoint: str, 
+        convert: bool = True
+    ) -> Dict[str, Any]:
         """Normalize purchase data - convert all currencies to EUR.
         
         Args:
             purchase: Raw purchase data from API
             trans_type: Transaction type ("0" for buy, "1" for sell)
             endpoint: Which endpoint this came from ("orders" or "payments")
+            convert: If False, leave amountFiat/price in the original currency
+                so a whole page can be converted by _convert_batch_to_eur
         """
         # Get original currency and convert to EUR
-        original_currency = purchase.get('fiatCurrency', '').upper()
-        print(f"Processing {original_currency} transaction")
+        original_currency = sys.intern(purchase.get('fiatCurrency', '').upper())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processing %s transaction", original_currency)
         
         # Create normalized record
         normalized = {
             'transactionType': trans_type,
             'endpoint': endpoint,  # Track which endpoint this came from
-            'createTime': purchase.get('createTime', purchase.get('orderCreateTime', 0)),
-            'updateTime': purchase.get('updateTime', purchase.get('orderUpdateTime', 0)),
-            'status': purchase.get('status', ''),
-            'paymentMethod': purchase.get('method', purchase.get('paymentMethod', '')),
         }
-        
-        # Handle different ID fields
-        if 'orderNo' in purchase:
-            normalized['orderId'] = purchase['orderNo']
-        elif 'paymentId' in purchase:
-            normalized['orderId'] = purchase['paymentId']
-        elif 'orderId' in purchase:
-            normalized['orderId'] = purchase['orderId']
+        for field, source_keys, default in _FIELD_MAP:
+            normalized[field] = _pick(purchase, source_keys, default)
+        
+        # Parse the three numeric fields in one pass
+        original_amount, amount_crypto, fee = map(float, (
+            _pick(purchase, _FIAT_AMOUNT_KEYS, 0.0),
+            _pick(purchase, _CRYPTO_AMOUNT_KEYS, 0.0),
+            _pick(purchase, _FEE_KEYS, 0.0),
+        ))
+        
+        # Convert fiat amount to EUR using simple conversion rates
+        if convert:
+            amount_fiat = self._convert_to_eur(original_amount, original_currency, normalized['createTime'])
         else:
-            normalized['orderId'] = ''
-        
-        # Get crypto currency
-        normalized['cryptoCurrency'] = purchase.get('cryptoCurrency', purchase.get('coin', ''))
-        
-        # Handle different amount fields and convert to EUR
-        if 'sourceAmount' in purchase:
-            original_amount = float(purchase['sourceAmount'])
-        elif 'amount' in purchase:
-            original_amount = float(purchase['amount'])
-        elif 'totalAmount' in purchase:
-            original_amount = float(purchase['totalAmount'])
-        elif 'indicatedAmount' in purchase:
-            original_amount = float(purchase['indicatedAmount'])
-        else:
-            original_amount = 0.0
-        
-        # Convert to EUR using simple conversion rates
-        eur_amount = self._convert_to_eur(original_amount, original_currency)
-        normalized['amountFiat'] = eur_amount
+            amount_fiat = original_amount
+        normalized['amountFiat'] = amount_fiat
         normalized['fiatCurrency'] = 'EUR'
         normalized['originalCurrency'] = original_currency
         normalized['originalAmount'] = original_amount
-            
-        # Handle crypto amount
-        if 'obtainAmount' in purchase:
-            normalized['amountCrypto'] = float(purchase['obtainAmount'])
-        elif 'cryptoAmount' in purchase:
-            normalized['amountCrypto'] = float(purchase['cryptoAmount'])
-        else:
-            normalized['amountCrypto'] = 0.0
-        
-        # Handle fees - EUR only
-        if 'totalFee' in purchase:
-            fee_amount = float(purchase['totalFee'])
-        elif 'fee' in purchase:
-            fee_amount = float(purchase['fee'])
-        else:
-            fee_amount = 0.0
         
-        normalized['fee'] = fee_amount
+        normalized['amountCrypto'] = amount_crypto
+        normalized['fee'] = fee  # EUR only
         
         # Calculate price in EUR per crypto unit
-        if normalized['amountCrypto'] > 0:
-            normalized['price'] = normalized['amountFiat'] / normalized['amountCrypto']
-        else:
-            normalized['price'] = 0.0
+        normalized['price'] = amount_fiat / amount_crypto if amount_crypto > 0 else 0.0
             
-        # Keep original data for debugging
-        normalized['_original'] = purchase
+        # Keep original data only when debugging; it roughly doubles each record
+        if self.keep_original:
+            normalized['_original'] = purchase
         
         return normalized
     
-    def _convert_to_eur(self, amount: float, currency: str) -> float:
-        """Convert amount from given currency to EUR using approximate rates.
+    def _eur_rate(self, currency: str, timestamp_ms: int) -> float:
+        """EUR per unit of currency on the transaction date, falling back to the approximate rates."""
+        if currency == 'EUR':
+            return 1.0
+        rate = self.fx_rates.rate(currency, timestamp_ms)
+        if rate is None:
+            rate = _FX_RATES_GET(currency, 1.0)  # Default to 1.0 if unknown
+        return rate
+    
+    def _convert_to_eur(self, amount: float, currency: str, timestamp_ms: int = 0) -> float:
+        """Convert amount from given currency to EUR at the ECB rate of the transaction date.
         
-        Note: These are approximate conversion rates. For precise tracking,
-        you should use historical exchange rates from the actual transaction dates.
+        Falls back to the approximate EUR_CONVERSION_RATES when no historical rate is cached.
         """
         if currency == 'EUR':
             return amount
         
-        # Approximate conversion rates (you may want to update these)
-        conversion_rates = {
-            'USD': 0.85,    # 1 USD ≈ 0.85 EUR
-            'GBP': 1.15,    # 1 GBP ≈ 1.15 EUR
-            'CHF': 0.95,    # 1 CHF ≈ 0.95 EUR
-            'CAD': 0.65,    # 1 CAD ≈ 0.65 EUR
-            'AUD': 0.60,    # 1 AUD ≈ 0.60 EUR
-            'JPY': 0.0065,  # 1 JPY ≈ 0.0065 EUR
-            'CNY': 0.125,   # 1 CNY ≈ 0.125 EUR
-            'HRK': 0.133,   # 1 HRK ≈ 0.133 EUR (7.5 HRK = 1 EUR)
-            'SEK': 0.090,   # 1 SEK ≈ 0.090 EUR
-            'NOK': 0.085,   # 1 NOK ≈ 0.085 EUR
-            'PLN': 0.22,    # 1 PLN ≈ 0.22 EUR
-        }
-        
-        rate = conversion_rates.get(currency, 1.0)  # Default to 1.0 if unknown
+        rate = self._eur_rate(currency, timestamp_ms)
         eur_amount = amount * rate
         
-        print(f"  Converting {amount:.2f} {currency} to {eur_amount:.2f} EUR (rate: {rate})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Converting %.2f %s to %.2f EUR (rate: %s)", amount, currency, eur_amount, rate)
         return eur_amount
     
-    def _deduplicate_purchases(self, purchases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate purchases based on time, amount, and crypto.
-        
-        Uses a 5-minute time window to match potentially duplicate records.
-        """
+    def _convert_batch_to_eur(self, purchases: List[Dict[str, Any]]) -> None:
+        """Convert amountFiat and price of unconverted normalized purchases to EUR in place."""
         if not purchases:
-            return []
+            return
         
+        count = len(purchases)
+        rates = np.fromiter(
+            (self._eur_rate(p['originalCurrency'], p['createTime']) for p in purchases),
+            dtype=np.float64, count=count
+        )
+        amounts = np.fromiter((p['originalAmount'] for p in purchases), dtype=np.float64, count=count)
+        crypto_amounts = np.fromiter((p['amountCrypto'] for p in purchases), dtype=np.float64, count=count)
+        
+        eur_amounts = amounts * rates
+        prices = np.divide(
+            eur_amounts, crypto_amounts,
+            out=np.zeros(count, dtype=np.float64), where=crypto_amounts > 0
+        )
+        
+        for purchase, eur_amount, price in zip(purchases, eur_amounts.tolist(), prices.tolist()):
+            purchase['amountFiat'] = eur_amount
+            purchase['price'] = price
+    
+    def _filter_new_purchases(
+        self, 
+        purchases: List[Dict[str, Any]], 
+        seen_keys: Set[bytes], 
+        currency_codes: Dict[str, int]
+    ) -> List[Dict[str, Any]]:
+        """Return the purchases whose dedup key is not in seen_keys, adding their keys to it.
+        
+        Passing the same seen_keys and currency_codes for successive batches deduplicates
+        them as one stream, so duplicates are dropped as pages arrive.
+        """
         deduplicated = []
-        seen_keys = set()
+        pack_key = _DEDUP_KEY_STRUCT.pack
         
         for purchase in purchases:
             # Create dedup key based on time (±5min), fiat amount, currency, crypto amount
             time_ms = purchase.get('createTime', 0)
             time_window = time_ms // (5 * 60 * 1000)  # 5-minute buckets
+            fiat_currency = purchase.get('fiatCurrency', '')
+            crypto_currency = purchase.get('cryptoCurrency', '')
             
-            dedup_key = (
+            # Packed into one bytes object: a single hash instead of a tuple of five
+            dedup_key = pack_key(
                 time_window,
-                purchase.get('fiatCurrency', ''),
-                round(purchase.get('amountFiat', 0), 2),  # Round to avoid floating point issues
-                purchase.get('cryptoCurrency', ''),
-                round(purchase.get('amountCrypto', 0), 6)
+                currency_codes.setdefault(fiat_currency, len(currency_codes)),
+                round(purchase.get('amountFiat', 0) * 100),  # Integer cents avoid floating point issues
+                currency_codes.setdefault(crypto_currency, len(currency_codes)),
+                round(purchase.get('amountCrypto', 0) * 1_000_000)
             )
             
             if dedup_key not in seen_keys:
@@ -220,7 +335,15 @@ class FiatOrdersFetcher:
         return delay
     
     def save_checkpoint(self, year: int, quarter: int, page: int, total_fetched: int):
-        """Save progress checkpoint."""
+        """Save progress checkpoint.
+        
+        Skipped if the position hasn't advanced since the last save. The file is
+        written to a temp path and renamed so a crash never leaves it half-written.
+        """
+        position = (year, quarter, page)
+        if position == self._last_checkpoint:
+            return
+        
         checkpoint = {
             "year": year,
             "quarter": quarter,
@@ -229,23 +352,37 @@ class FiatOrdersFetcher:
             "timestamp": datetime.now().isoformat()
         }
         
-        checkpoint_file = self.exports_dir / "fetch_checkpoint.json"
-        with open(checkpoint_file, 'w') as f:
-            json.dump(checkpoint, f, indent=2)
+        with open(self._checkpoint_temp_file, 'wb') as f:
+            f.write(_dumps(checkpoint))
+        os.replace(self._checkpoint_temp_file, self._checkpoint_file)
+        self._last_checkpoint = position
+        self._checkpoint = checkpoint
+        self._checkpoint_loaded = True
     
     def load_checkpoint(self) -> Optional[Dict[str, Any]]:
-        """Load progress checkpoint if exists."""
-        checkpoint_file = self.exports_dir / "fetch_checkpoint.json"
-        if checkpoint_file.exists():
-            with open(checkpoint_file, 'r') as f:
-                return json.load(f)
-        return None
+        """Load progress checkpoint if exists.
+        
+        The file is read at most once per fetcher; later calls return the copy kept by
+        save_checkpoint/clear_checkpoint.
+        """
+        if not self._checkpoint_loaded:
+            try:
+                with open(self._checkpoint_file, 'rb') as f:
+                    self._checkpoint = _loads(f.read())
+            except FileNotFoundError:
+                self._checkpoint = None
+            self._checkpoint_loaded = True
+        return self._checkpoint
     
     def clear_checkpoint(self):
         """Clear progress checkpoint."""
-        checkpoint_file = self.exports_dir / "fetch_checkpoint.json"
-        if checkpoint_file.exists():
-            checkpoint_file.unlink()
+        try:
+            self._checkpoint_file.unlink()
+        except FileNotFoundError:
+            pass
+        self._last_checkpoint = None
+        self._checkpoint = None
+        self._checkpoint_loaded = True
     
     def fetch_all_purchases(
         self, 
@@ -267,6 +404,9 @@ class FiatOrdersFetcher:
         if dry_run:
             return self._dry_run_analysis(windows)
         
+        # Historical FX rates: one ECB download per day at most, cached in the data directory
+        self.fx_rates.ensure_fresh()
+        
         # Check for existing checkpoint
         checkpoint = self.load_checkpoint()
         start_window_index = 0
@@ -274,140 +414,45 @@ class FiatOrdersFetcher:
         total_fetched = 0
         
         if checkpoint:
-            # Find where to resume
-            for i, (begin_time, end_time) in enumerate(windows):
-                year = datetime.fromtimestamp(begin_time / 1000).year
-                quarter = (datetime.fromtimestamp(begin_time / 1000).month - 1) // 3 + 1
-                
-                if year == checkpoint["year"] and quarter == checkpoint["quarter"]:
-                    start_window_index = i
-                    start_page = checkpoint["page"]
-                    total_fetched = checkpoint["total_fetched"]
-                    self._emit_progress(
-                        f"Resuming from {year} Q{quarter}, page {start_page}", 
-                        start_window_index, len(windows)
-                    )
-                    break
-        
-        all_purchases = []
+            # Windows run four per year from Q1 of start_year, so the resume point is direct
+            resume_index = (checkpoint["year"] - start_year) * 4 + checkpoint["quarter"] - 1
+            if 0 <= resume_index < len(windows):
+                start_window_index = resume_index
+                start_page = checkpoint["page"]
+                total_fetched = checkpoint["total_fetched"]
+                self._emit_progress(
+                    f"Resuming from {checkpoint['year']} Q{checkpoint['quarter']}, page {start_page}", 
+                    start_window_index, len(windows)
+                )
+        
+        # Owned here and filled page by page, so an interrupted fetch still keeps what arrived
+        window_purchases: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+        fetch_stats = {'fetched': total_fetched, 'windows_done': 0}
         
         try:
-            # Fetch both BUY (0) and SELL (1) transactions from /fiat/payments (primary)
-            # /fiat/orders is severely rate-limited and often unusable
-            for trans_type in ["0", "1"]:
-                trans_name = "BUY" if trans_type == "0" else "SELL"
-                
-                # Use only /fiat/payments as it works reliably
-                endpoint_name, endpoint_func = "payments", self.client.get_fiat_payments
-                self._emit_progress(f"Fetching {trans_name} from /fiat/{endpoint_name}...", 0, len(windows) * 2)
-                
-                trans_purchases = []  # Collect all purchases for this transaction type
-                    
-                for window_index in range(start_window_index, len(windows)):
-                    begin_time, end_time = windows[window_index]
-                    start_date = datetime.fromtimestamp(begin_time / 1000)
-                    year = start_date.year
-                    quarter = (start_date.month - 1) // 3 + 1
-                    
-                    self._emit_progress(
-                        f"{trans_name} /fiat/{endpoint_name} {year} Q{quarter}...", 
-                        window_index, len(windows)
-                    )
-                    
-                    page = start_page if window_index == start_window_index else 1
-                    window_purchases = []
-                    
-                    while True:
-                        try:
-                            # Fetch page using the appropriate endpoint
-                            response = endpoint_func(
-                                transaction_type=trans_type,  # BUY or SELL
-                                begin_time=begin_time,
-                                end_time=end_time,
-                                page=page,
-                                rows=500
-                            )
-                            
-                            purchases = response.get('data', [])
-                            
-                            if not purchases:
-                                # No more data for this window - this is normal for empty periods
-                                break
-                            
-                            # Normalize and tag each purchase (convert all to EUR)
-                            normalized_purchases = []
-                            for purchase in purchases:
-                                # Only process successful transactions
-                                status = purchase.get('status', '').lower()
-                                if status in ['completed', 'successful', 'finished']:
-                                    normalized = self._normalize_purchase(purchase, trans_type, endpoint_name)
-                                    if normalized is not None:
-                                        normalized_purchases.append(normalized)
-                                else:
-                                    print(f"  Skipping transaction with status: {status}")
-                            
-                            # Add to collections
-                            window_purchases.extend(normalized_purchases)
-                            total_fetched += len(normalized_purchases)
-                            
-                            self._emit_progress(
-                                f"{trans_name} /fiat/{endpoint_name} {year} Q{quarter} page {page}: {len(normalized_purchases)} orders", 
-                                window_index, len(windows)
-                            )
-                            
-                            page += 1
-                            
-                            # Rate limiting between pages using configured delay
-                            time.sleep(self.sleep_seconds)
-                                
-                        except Exception as e:
-                            error_msg = f"Error fetching {trans_name} /fiat/{endpoint_name} {year} Q{quarter} page {page}: {str(e)}"
-                            self._emit_progress(error_msg, window_index, len(windows))
-                            
-                            # For authentication or critical errors, stop completely
-                            if "Authentication failed" in str(e) or "signature" in str(e).lower():
-                                raise e
-                            
-                            # Handle rate limiting with exponential backoff
-                            if "rate_limited" in str(e):
-                                backoff_time = self._exponential_backoff(page)
-                                self._emit_progress(
-                                    f"Rate limited - backing off for {backoff_time}s", 
-                                    window_index, len(windows)
-                                )
-                                time.sleep(backoff_time)
-                                continue  # Retry the same page
-                            
-                            # For other errors, skip to next window after short delay
-                            time.sleep(5)
-                            break
-                    
-                    # Add this window's purchases to transaction collection
-                    trans_purchases.extend(window_purchases)
-                    
-                    # Sleep between windows using configured delay (slightly longer)
-                    if window_index < len(windows) - 1:
-                        time.sleep(self.sleep_seconds * 2.0)
-                
-                # Add all purchases from this transaction type to main collection
-                all_purchases.extend(trans_purchases)
-                
-                # Reset for next transaction type
-                start_page = 1
-        
+            asyncio.run(
+                self._fetch_all_async(windows, start_window_index, start_page, window_purchases, fetch_stats)
+            )
         except KeyboardInterrupt:
             self._emit_progress("Fetch interrupted by user", 0, 0)
         except Exception as e:
             self._emit_progress(f"Fetch failed: {str(e)}", 0, 0)
             raise
         
+        # Keep the order (transaction type, window, page)
+        all_purchases = [
+            purchase for key in sorted(window_purchases) for purchase in window_purchases[key]
+        ]
+        total_fetched = fetch_stats['fetched']
+        windows_done = fetch_stats['windows_done']
+        completed = start_window_index + windows_done >= len(windows)
+        
         # Clear checkpoint on successful completion
-        if window_index >= len(windows) - 1:
+        if completed:
             self.clear_checkpoint()
         
-        # Deduplicate merged results
-        self._emit_progress("Deduplicating merged results...", 0, 1)
-        deduplicated_purchases = self._deduplicate_purchases(all_purchases)
+        # Purchases were deduplicated page by page while fetching (_filter_new_purchases)
+        deduplicated_purchases = all_purchases
         
         # Save deduplicated results to database
         if deduplicated_purchases:
@@ -421,12 +466,161 @@ class FiatOrdersFetcher:
             "total_fetched": len(deduplicated_purchases),
             "raw_fetched": total_fetched,
             "duplicates_removed": total_fetched - len(deduplicated_purchases),
-            "windows_processed": window_index + 1,
+            "windows_processed": start_window_index + windows_done,
             "total_windows": len(windows),
-            "completed": window_index >= len(windows) - 1
+            "completed": completed
         }
     
-    def _dry_run_analysis(self, windows: List[Tuple[int, int]]) -> Dict[str, Any]:
+    async def _fetch_all_async(
+        self,
+        windows: List[Tuple[int, int, int, int]],
+        start_window_index: int,
+        start_page: int,
+        window_purchases: Dict[Tuple[str, int], List[Dict[str, Any]]],
+        fetch_stats: Dict[str, int]
+    ) -> None:
+        """Fetch every window for BUY and SELL with bounded concurrency.
+        
+        Windows are independent, so up to ``MAX_CONCURRENT_WINDOWS`` of them page
+        in parallel; pages within a window stay sequential. Every page is
+        deduplicated against one shared key set as it arrives, so duplicates are
+        never accumulated.
+        
+        Results go into the caller's containers as each page arrives, so they survive cancellation:
+        window_purchases gets the unique purchases per (transaction type, window index), in page order,
+        fetch_stats['fetched'] counts purchases before dedup, and fetch_stats['windows_done'] is set
+        at the end to the number of windows finished for both types.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_WINDOWS)
+        seen_keys: Set[bytes] = set()
+        currency_codes: Dict[str, int] = {}
+        window_indexes = range(start_window_index, len(windows))
+        window_finished = [True] * len(window_indexes)  # Cleared when either type stops a window early
+        
+        async def fetch_window(trans_type: str, window_index: int) -> bool:
+            first_page = start_page if window_index == start_window_index else 1
+            purchases = window_purchases.setdefault((trans_type, window_index), [])
+            async with semaphore:
+                return await self._fetch_window_async(
+                    trans_type, windows, window_index, first_page, seen_keys, currency_codes,
+                    purchases, fetch_stats
+                )
+        
+        async with self.client:
+            # Fetch both BUY (0) and SELL (1) transactions from /fiat/payments (primary)
+            # /fiat/orders is severely rate-limited and often unusable
+            for trans_type in ["0", "1"]:
+                trans_name = "BUY" if trans_type == "0" else "SELL"
+                self._emit_progress(f"Fetching {trans_name} from /fiat/payments...", 0, len(windows) * 2)
+                
+                window_results = await asyncio.gather(
+                    *[fetch_window(trans_type, i) for i in window_indexes]
+                )
+                for position, finished in enumerate(window_results):
+                    window_finished[position] = window_finished[position] and finished
+        
+        fetch_stats['windows_done'] = sum(window_finished)
+    
+    async def _fetch_window_async(
+        self,
+        trans_type: str,
+        windows: List[Tuple[int, int, int, int]],
+        window_index: int,
+        page: int,
+        seen_keys: Set[bytes],
+        currency_codes: Dict[str, int],
+        window_purchases: List[Dict[str, Any]],
+        fetch_stats: Dict[str, int]
+    ) -> bool:
+        """Page through a single quarter window until an empty page is returned.
+        
+        Purchases not seen before are appended to window_purchases, and fetch_stats['fetched']
+        is increased by each page's normalized purchase count, as every page arrives.
+        
+        Returns:
+            True if the window was paged to its end rather than abandoned after an error
+        """
+        trans_name = "BUY" if trans_type == "0" else "SELL"
+        endpoint_name = "payments"
+        begin_time, end_time, year, quarter = windows[window_index]
+        
+        self._emit_progress(
+            f"{trans_name} /fiat/{endpoint_name} {year} Q{quarter}...", 
+            window_index, len(windows)
+        )
+        
+        finished = False
+        
+        while True:
+            try:
+                await self._pace()
+                response, = await self.client.aget_fiat_payments(
+                    [page],
+                    transaction_type=trans_type,  # BUY or SELL
+                    begin_time=begin_time,
+                    end_time=end_time,
+                    rows=500
+                )
+                
+                purchases = response.get('data', [])
+                
+                if not purchases:
+                    # No more data for this window - this is normal for empty periods
+                    finished = True
+                    break
+                
+                # Normalize and tag each purchase (convert all to EUR)
+                normalized_purchases = []
+                for purchase in purchases:
+                    # Only process successful transactions
+                    status = purchase.get('status', '').lower()
+                    if status in _OK_STATUS:
+                        normalized = self._normalize_purchase(
+                            purchase, trans_type, endpoint_name, convert=False
+                        )
+                        if normalized is not None:
+                            normalized_purchases.append(normalized)
+                    else:
+                        logger.debug("Skipping transaction with status: %s", status)
+                
+                self._convert_batch_to_eur(normalized_purchases)
+                fetch_stats['fetched'] += len(normalized_purchases)
+                window_purchases.extend(
+                    self._filter_new_purchases(normalized_purchases, seen_keys, currency_codes)
+                )
+                
+                self._emit_progress(
+                    f"{trans_name} /fiat/{endpoint_name} {year} Q{quarter} page {page}: {len(normalized_purchases)} orders", 
+                    window_index, len(windows)
+                )
+                
+                page += 1
+                    
+            except Exception as e:
+                error_msg = f"Error fetching {trans_name} /fiat/{endpoint_name} {year} Q{quarter} page {page}: {str(e)}"
+                self._emit_progress(error_msg, window_index, len(windows))
+                
+                # For authentication or critical errors, stop completely
+                if "Authentication failed" in str(e) or "signature" in str(e).lower():
+                    raise e
+                
+                # Handle rate limiting with exponential backoff
+                if "rate_limited" in str(e):
+                    backoff_time = self._exponential_backoff(page)
+                    self._emit_progress(
+                        f"Rate limited - backing off for {backoff_time}s", 
+                        window_index, len(windows)
+                    )
+                    await asyncio.sleep(backoff_time)
+                    continue  # Retry the same page
+                
+                # For other errors, skip to next window after short delay
+                await asyncio.sleep(5)
+                break
+        
+        return finished
+    
+    def _dry_run_analysis(self, windows: List[Tuple[int, int, int, int]]) -> Dict[str, Any]:
         """Analyze expected API calls without making them."""
         return {
             "total_windows": len(windows),
@@ -445,28 +639,34 @@ class FiatOrdersFetcher:
             return
         
         backup_file = self.exports_dir / f"purchases_backup_{year}_Q{quarter}.json"
-        with open(backup_file, 'w') as f:
-            json.dump({
+        with open(backup_file, 'wb') as f:
+            f.write(_dumps({
                 "year": year,
                 "quarter": quarter,
                 "count": len(purchases),
                 "exported_at": datetime.now().isoformat(),
                 "purchases": purchases
-            }, f, indent=2)
+            }, indent=True))
     
     def _export_final_results(self, all_purchases: List[Dict[str, Any]]):
         """Export final consolidated results."""
         if not all_purchases:
             return
         
-        # Export JSON
+        # Export JSON, one purchase per line so the whole document is never built in memory.
+        # The raw API payload (_original) is debugging data and is left out.
         json_file = self.exports_dir / "purchases.json"
-        with open(json_file, 'w') as f:
-            json.dump({
-                "total_count": len(all_purchases),
-                "exported_at": datetime.now().isoformat(),
-                "purchases": all_purchases
-            }, f, indent=2)
+        with open(json_file, 'wb') as f:
+            f.write(b'{"total_count":%d,"exported_at":%s,"purchases":[\n' % (
+                len(all_purchases), _dumps(datetime.now().isoformat())
+            ))
+            for index, purchase in enumerate(all_purchases):
+                if index:
+                    f.write(b',\n')
+                if self.keep_original:
+                    purchase = {k: v for k, v in purchase.items() if k != '_original'}
+                f.write(_dumps(purchase))
+            f.write(b'\n]}\n')
         
         # Export CSV
         if all_purchases:
@@ -487,32 +687,27 @@ class FiatOrdersFetcher:
                 'crypto', 'amountCrypto', 'unitPrice', 'fee', 'paymentMethod', 'endpoint'
             ])
             
-            for purchase in purchases:
-                # Format timestamp
-                timestamp = purchase.get('createTime', purchase.get('time', 0))
-                time_iso = datetime.fromtimestamp(timestamp / 1000).isoformat() if timestamp else ''
-                
-                # Use the normalized data (already processed)
-                fiat_amount = purchase.get('amountFiat', 0)
-                fiat_currency = purchase.get('fiatCurrency', '')
-                crypto_amount = purchase.get('amountCrypto', 0)
-                unit_price = purchase.get('price', 0)
-                fee = purchase.get('fee', 0)
-                
-                # Transaction type display
-                trans_type = purchase.get('transactionType', '0')
-                trans_type_display = 'BUY' if trans_type == '0' else 'SELL'
-                
-                writer.writerow([
-                    time_iso,
-                    purchase.get('orderId', ''),
-                    trans_type_display,
-                    fiat_currency,
-                    round(fiat_amount, 2),
-                    purchase.get('cryptoCurrency', ''),
-                    crypto_amount,
-                    round(unit_price, 6),
-                    round(fee, 2),
-                    purchase.get('paymentMethod', ''),
-                    purchase.get('endpoint', '')
-                ])
+            writer.writerows(self._csv_rows(purchases))
+    
+    def _csv_rows(self, purchases: List[Dict[str, Any]]):
+        """Yield CSV rows for purchases, in the column order of _export_purchases_csv."""
+        fromtimestamp = datetime.fromtimestamp
+        for purchase in purchases:
+            get = purchase.get
+            # Format timestamp
+            timestamp = get('createTime', get('time', 0))
+            
+            # Use the normalized data (already processed)
+            yield (
+                fromtimestamp(timestamp / 1000).isoformat() if timestamp else '',
+                get('orderId', ''),
+                'BUY' if get('transactionType', '0') == '0' else 'SELL',
+                get('fiatCurrency', ''),
+                round(get('amountFiat', 0), 2),
+                get('cryptoCurrency', ''),
+                get('amountCrypto', 0),
+                round(get('price', 0), 6),
+                round(get('fee', 0), 2),
+                get('paymentMethod', ''),
+                get('endpoint', '')
+            )
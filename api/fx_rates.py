@@ -0,0 +1,154 @@
+"""Historical EUR exchange rates cached on disk, sourced from the ECB reference rates."""
+import bisect
+import csv
+import io
+import json
+import logging
+import os
+import time
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Full history of ECB euro reference rates as a zipped CSV (one row per business day)
+ECB_HISTORY_URL = "https://www.ecb.europa.eu/stats/eurofxref/eurofxref-hist.zip"
+
+
+class FxRateCache:
+    """EUR value of one unit of a currency on a given day.
+
+    Rates are kept as {currency: {yyyymmdd: eur_per_unit}} in a JSON file in the
+    data directory. Lookups for weekends and holidays fall back to the most
+    recent earlier business day.
+    """
+
+    REFRESH_AFTER_SECONDS = 24 * 3600
+    MAX_FALLBACK_DAYS = 7  # Oldest rate still accepted for a date without a fixing
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._rates: Dict[Tuple[str, int], float] = {}
+        self._dates: Dict[str, List[int]] = {}  # Sorted yyyymmdd keys per currency
+        self._loaded = False
+
+    def load(self):
+        """Load cached rates from disk; a missing or unreadable file leaves the cache empty."""
+        self._loaded = True
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                table = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read FX rate cache %s: %s", self.path, e)
+            return
+        self._index(table)
+
+    def is_stale(self) -> bool:
+        """True if the cache file is missing or older than REFRESH_AFTER_SECONDS."""
+        try:
+            return time.time() - self.path.stat().st_mtime > self.REFRESH_AFTER_SECONDS
+        except OSError:
+            return True
+
+    def refresh(self, timeout: float = 30.0) -> bool:
+        """Download the ECB history (one request) and rewrite the cache file.
+
+        Returns:
+            True if the cache file was updated
+        """
+        try:
+            response = httpx.get(ECB_HISTORY_URL, timeout=timeout, follow_redirects=True)
+            response.raise_for_status()
+            table = self._parse_ecb_zip(response.content)
+        except (httpx.HTTPError, zipfile.BadZipFile, KeyError, ValueError) as e:
+            logger.warning("FX rate refresh failed: %s", e)
+            return False
+
+        # The downloaded rates are used for this session even if they can't be written to disk
+        self._index(table)
+        self._loaded = True
+
+        tmp_path = self.path.with_suffix('.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(table, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not write FX rate cache %s: %s", self.path, e)
+            return False
+        return True
+
+    def ensure_fresh(self):
+        """Load the cache and refresh it from the ECB when stale."""
+        if not self._loaded:
+            self.load()
+        if self.is_stale():
+            self.refresh()
+
+    def rate(self, currency: str, timestamp_ms: int) -> Optional[float]:
+        """EUR per unit of ``currency`` on the UTC day of ``timestamp_ms``, or None if unknown."""
+        if not self._loaded:
+            self.load()
+        if not timestamp_ms:
+            return None
+
+        day = datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+        date_key = day.year * 10000 + day.month * 100 + day.day
+        rate = self._rates.get((currency, date_key))
+        if rate is not None:
+            return rate
+
+        # No fixing that day: use the latest earlier business day within the fallback window
+        dates = self._dates.get(currency)
+        if not dates:
+            return None
+        i = bisect.bisect_right(dates, date_key)
+        if i == 0:
+            return None
+        previous = dates[i - 1]
+        previous_day = datetime(previous // 10000, previous // 100 % 100, previous % 100, tzinfo=timezone.utc)
+        if (day - previous_day).days > self.MAX_FALLBACK_DAYS:
+            return None
+        return self._rates[(currency, previous)]
+
+    def _index(self, table: Dict[str, Dict[str, float]]):
+        """Build the flat lookup dict and per-currency date lists from the on-disk layout."""
+        rates = {}
+        dates = {}
+        for currency, by_date in table.items():
+            keys = sorted(int(date_key) for date_key in by_date)
+            for date_key in keys:
+                rates[(currency, date_key)] = by_date[str(date_key)]
+            dates[currency] = keys
+        self._rates = rates
+        self._dates = dates
+
+    @staticmethod
+    def _parse_ecb_zip(content: bytes) -> Dict[str, Dict[str, float]]:
+        """Turn the ECB CSV (units per EUR) into {currency: {yyyymmdd: EUR per unit}}."""
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            text = archive.read(archive.namelist()[0]).decode('utf-8')
+
+        table: Dict[str, Dict[str, float]] = {}
+        reader = csv.reader(io.StringIO(text))
+        header = [column.strip() for column in next(reader)]
+        currencies = header[1:]
+        for row in reader:
+            if not row or not row[0].strip():
+                continue
+            date_key = row[0].strip().replace('-', '')
+            for currency, value in zip(currencies, row[1:]):
+                value = value.strip()
+                if not currency or not value or value == 'N/A':
+                    continue
+                units_per_eur = float(value)
+                if units_per_eur > 0:
+                    table.setdefault(currency, {})[date_key] = 1.0 / units_per_eur
+        return table
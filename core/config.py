@@ -1,18 +1,27 @@
 """Configuration management for Binance Credit Card Purchase Tracker."""
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
-from pydantic import BaseModel
-from dotenv import load_dotenv
+from typing import Dict, Optional, Tuple
+from dotenv import dotenv_values
 
 
-class Config(BaseModel):
-    """Application configuration."""
+@dataclass(frozen=True)
+class Config:
+    """Application configuration.
+    
+    Values are coerced to their types in load_config; the class does no validation itself.
+    """
     
     # API Configuration
     binance_api_key: str
     binance_api_secret: str
     
+    # File paths
+    app_dir: Path
+    data_dir: Path
+    exports_dir: Path
+    
     # Application Settings
     api_delay_ms: int = 35  # API call delay in milliseconds
     start_year: int = 2016
@@ -20,18 +29,28 @@ class Config(BaseModel):
     preferred_fiat_currency: Optional[str] = None  # Auto-detect from transactions if not set
     chart_library: str = "pyqtgraph"  # Chart library: "pyqtgraph" or "matplotlib"
     
-    # File paths
-    app_dir: Path
-    data_dir: Path
-    exports_dir: Path
-    
     # Optional donation settings
     donation_btc_address: Optional[str] = None
     donation_eth_address: Optional[str] = None
     donation_url: Optional[str] = None
-    
-    class Config:
-        arbitrary_types_allowed = True
+
+
+# Parsed .env files keyed by path, with the mtime they were parsed at
+_env_cache: Dict[Path, Tuple[float, Dict[str, Optional[str]]]] = {}
+
+
+def _read_env_file(env_path: Path) -> Dict[str, Optional[str]]:
+    """Parse a .env file, reusing the previous parse while the file is unchanged."""
+    try:
+        mtime = env_path.stat().st_mtime
+    except OSError:
+        return {}
+    cached = _env_cache.get(env_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    values = dotenv_values(env_path)
+    _env_cache[env_path] = (mtime, values)
+    return values
 
 
 def load_config(app_dir: Optional[Path] = None) -> Config:
@@ -39,10 +58,14 @@ def load_config(app_dir: Optional[Path] = None) -> Config:
     if app_dir is None:
         app_dir = Path(__file__).parent.parent
     
-    # Load .env file if it exists
-    env_path = app_dir / ".env"
-    if env_path.exists():
-        load_dotenv(env_path)
+    # Real environment variables take precedence over the .env file, which is not copied into os.environ
+    env = _read_env_file(app_dir / ".env")
+    
+    def _get(key: str, default: Optional[str] = None) -> Optional[str]:
+        value = os.environ.get(key)
+        if value is None:
+            value = env.get(key)
+        return default if value is None else value
     
     # Set up directories
     data_dir = app_dir / "data"
@@ -51,8 +74,8 @@ def load_config(app_dir: Optional[Path] = None) -> Config:
     exports_dir.mkdir(exist_ok=True)
     
     # Get required API credentials
-    api_key = os.getenv("BINANCE_API_KEY")
-    api_secret = os.getenv("BINANCE_API_SECRET")
+    api_key = _get("BINANCE_API_KEY")
+    api_secret = _get("BINANCE_API_SECRET")
     
     if not api_key or not api_secret:
         raise ValueError("BINANCE_API_KEY and BINANCE_API_SECRET must be set in .env file")
@@ -60,18 +83,18 @@ def load_config(app_dir: Optional[Path] = None) -> Config:
     return Config(
         binance_api_key=api_key,
         binance_api_secret=api_secret,
-        api_delay_ms=int(os.getenv("API_DELAY_MS", "35")),
-        start_year=int(os.getenv("START_YEAR", "2016")),
-        end_year=int(os.getenv("END_YEAR", "2025")),
-        preferred_fiat_currency=os.getenv("PREFERRED_FIAT_CURRENCY"),  # Auto-detect if not set
-        chart_library=os.getenv("CHART_LIBRARY", "pyqtgraph"),  # Default to pyqtgraph
+        api_delay_ms=int(_get("API_DELAY_MS", "35")),
+        start_year=int(_get("START_YEAR", "2016")),
+        end_year=int(_get("END_YEAR", "2025")),
+        preferred_fiat_currency=_get("PREFERRED_FIAT_CURRENCY"),  # Auto-detect if not set
+        chart_library=_get("CHART_LIBRARY", "pyqtgraph"),  # Default to pyqtgraph
         app_dir=app_dir,
         data_dir=data_dir,
         exports_dir=exports_dir,
         # Note: Using JSON storage, no database needed
-        donation_btc_address=os.getenv("DONATION_BTC_ADDRESS"),
-        donation_eth_address=os.getenv("DONATION_ETH_ADDRESS"),
-        donation_url=os.getenv("DONATION_URL"),
+        donation_btc_address=_get("DONATION_BTC_ADDRESS"),
+        donation_eth_address=_get("DONATION_ETH_ADDRESS"),
+        donation_url=_get("DONATION_URL"),
     )
 
 
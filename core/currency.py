@@ -1,50 +1,139 @@
 """Universal currency system for crypto portfolio tracking."""
-from typing import Dict, Optional, Set, List
-from collections import Counter
+from typing import Any, Callable, Dict, FrozenSet, Optional, List, Tuple
+from collections import OrderedDict
+
+# Fiat currencies considered by detect_primary_fiat_currency, and their list positions
+_FIAT_CODES = ('EUR', 'USD', 'GBP', 'CAD', 'AUD', 'JPY')
+_FIAT_INDEX = {code: i for i, code in enumerate(_FIAT_CODES)}
+_SUPPORTED_FIAT = frozenset(_FIAT_CODES)
+
+
+class _IdentityMemo:
+    """Small LRU memo keyed on the identity and length of the first argument.
+    
+    The prices dict and transaction lists are replaced wholesale on every refresh,
+    never mutated in place, so (id, len) identifies their content without hashing
+    every element. Each entry holds a reference to its input, which keeps the id
+    from being reused by another object while the entry is cached.
+    """
+    
+    def __init__(self, func: Callable, maxsize: int = 4):
+        self.func = func
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple, Tuple[Any, Any]]" = OrderedDict()
+    
+    def __call__(self, data, *args):
+        key = (id(data), len(data)) + args
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is data:
+            self._entries.move_to_end(key)
+            return entry[1]
+        
+        result = self.func(data, *args)
+        self._entries[key] = (data, result)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+    
+    def cache_clear(self):
+        self._entries.clear()
+
+
+def clear_currency_caches() -> None:
+    """Drop memoized price maps and currency detections (e.g. after an in-place data change)."""
+    _detect_primary_fiat_currency_memo.cache_clear()
+    _build_price_map_memo.cache_clear()
 
 
 def detect_primary_fiat_currency(transactions: List[Dict]) -> str:
     """Auto-detect the primary fiat currency from transaction history.
     
+    Results are memoized per transactions list; see _IdentityMemo.
+    
     Args:
         transactions: List of transaction records
         
     Returns:
         Most commonly used fiat currency code (EUR, USD, etc.)
     """
-    if not transactions:
-        return "EUR"  # Default to EUR
+    return _detect_primary_fiat_currency_memo(transactions)
+
+
+def _detect_primary_fiat_currency(transactions: List[Dict]) -> str:
+    """Uncached implementation of detect_primary_fiat_currency."""
+    return scan_transactions(transactions)['primary_currency']
+
+
+def scan_transactions(transactions: List[Dict]) -> Dict[str, Any]:
+    """Collect the per-transaction aggregates the app needs in a single pass.
     
-    # Count currency usage
-    currency_counts = Counter()
-    currency_amounts = {}
+    Args:
+        transactions: List of transaction records
+        
+    Returns:
+        Dictionary with primary_currency (see detect_primary_fiat_currency),
+        currencies (original currencies), payment_methods, amount_total and
+        amount_count (over records with amountFiat), and min_ts/max_ts
+        (createTime in ms, None if no record has one)
+    """
+    # Sum volume per currency in a fixed-size list indexed by currency
+    currency_index = _FIAT_INDEX.get
+    currency_amounts = [0.0] * len(_FIAT_CODES)
+    seen = []  # Currency indexes in first-seen order, so ties resolve as before
+    currencies = set()
+    payment_methods = set()
+    amount_total = 0
+    amount_count = 0
+    min_ts = max_ts = None
     
     for tx in transactions:
-        currency = tx.get('fiatCurrency', '').upper()
-        amount = tx.get('amountFiat', 0)
+        amount = tx.get('amountFiat')
+        if amount is not None:
+            amount_total += amount
+            amount_count += 1
+        
+        idx = currency_index(tx.get('fiatCurrency', '').upper())
+        if idx is not None:
+            if idx not in seen:
+                seen.append(idx)
+            currency_amounts[idx] += abs(amount or 0)
         
-        if currency and currency in ['EUR', 'USD', 'GBP', 'CAD', 'AUD', 'JPY']:
-            currency_counts[currency] += 1
-            if currency not in currency_amounts:
-                currency_amounts[currency] = 0
-            currency_amounts[currency] += abs(amount)
+        if 'originalCurrency' in tx:
+            currencies.add(tx['originalCurrency'])
+        if 'paymentMethod' in tx:
+            payment_methods.add(tx['paymentMethod'])
+        
+        create_time = tx.get('createTime')
+        if create_time:
+            if min_ts is None or create_time < min_ts:
+                min_ts = create_time
+            if max_ts is None or create_time > max_ts:
+                max_ts = create_time
     
-    if not currency_counts:
-        return "EUR"  # Default fallback
+    # The currency with highest transaction volume (more reliable than just transaction count)
+    if seen:
+        primary_currency = _FIAT_CODES[max(seen, key=currency_amounts.__getitem__)]
+    else:
+        primary_currency = "EUR"  # Default fallback
     
-    # Return the currency with highest transaction volume
-    # (more reliable than just transaction count)
-    primary_currency = max(currency_amounts.keys(), key=lambda c: currency_amounts[c])
-    return primary_currency
+    return {
+        'primary_currency': primary_currency,
+        'currencies': currencies,
+        'payment_methods': payment_methods,
+        'amount_total': amount_total,
+        'amount_count': amount_count,
+        'min_ts': min_ts,
+        'max_ts': max_ts,
+    }
 
 
-def get_supported_fiat_currencies() -> Set[str]:
+def get_supported_fiat_currencies() -> FrozenSet[str]:
     """Get set of supported fiat currencies.
     
     Returns:
-        Set of supported currency codes
+        Frozen set of supported currency codes (shared, so it cannot be modified)
     """
-    return {'EUR', 'USD', 'GBP', 'CAD', 'AUD', 'JPY'}
+    return _SUPPORTED_FIAT
 
 
 def validate_fiat_currency(currency: str) -> bool:
@@ -56,7 +145,7 @@ def validate_fiat_currency(currency: str) -> bool:
     Returns:
         True if currency is supported, False otherwise
     """
-    return currency.upper() in get_supported_fiat_currencies()
+    return currency.upper() in _SUPPORTED_FIAT
 
 
 
@@ -66,6 +155,8 @@ def validate_fiat_currency(currency: str) -> bool:
 def build_price_map(tickers: Dict[str, float], base_currency: str = "EUR") -> Dict[str, float]:
     """Build a mapping from crypto assets to base currency prices.
     
+    Results are memoized per tickers dict; the returned map is shared and must not be modified.
+    
     Args:
         tickers: Dictionary of symbol -> price from Binance API
         base_currency: Base fiat currency (EUR, USD, etc.)
@@ -73,37 +164,48 @@ def build_price_map(tickers: Dict[str, float], base_currency: str = "EUR") -> Di
     Returns:
         Dictionary mapping asset symbol to base currency price
     """
+    return _build_price_map_memo(tickers, base_currency.upper())
+
+
+def _build_price_map(tickers: Dict[str, float], base_currency: str = "EUR") -> Dict[str, float]:
+    """Uncached implementation of build_price_map.
+    
+    Each pass is a comprehension filtered by str.endswith, which runs in C; bucketing
+    every symbol by quote suffix in a single Python loop measured slower, and the
+    USDT pass is usually skipped altogether.
+    """
     base_currency = base_currency.upper()
-    prices = {}
+    base_len = len(base_currency)
+    items = tickers.items()
     
     # First, get direct pairs (e.g., BTCEUR, BTCUSD)
-    base_suffix = base_currency
-    for symbol, price in tickers.items():
-        if symbol.endswith(base_suffix):
-            asset = symbol[:-len(base_suffix)]
-            prices[asset] = price
+    prices = {symbol[:-base_len]: price for symbol, price in items if symbol.endswith(base_currency)}
     
-    # If we don't have many direct pairs, use USDT bridge
+    # If we don't have many direct pairs, use USDT bridge (never overriding direct pairs).
+    # A bridge only runs once its quote has a direct price, so a USDT or BTC base (no
+    # USDTUSDT / BTCBTC pair) skips its own bridge without a special case.
     usdt_base_price = prices.get("USDT")
     if usdt_base_price and len(prices) < 10:  # Not many direct pairs available
-        for symbol, price in tickers.items():
-            if symbol.endswith("USDT"):
-                asset = symbol[:-4]  # Remove USDT suffix
-                if asset not in prices:  # Don't override direct pairs
-                    prices[asset] = price * usdt_base_price
+        prices.update([
+            (symbol[:-4], price * usdt_base_price) for symbol, price in items
+            if symbol.endswith("USDT") and symbol[:-4] not in prices
+        ])
     
-    # Use BTC bridge for remaining assets
+    # Use BTC bridge for remaining assets (never overriding existing mappings)
     btc_base_price = prices.get("BTC")
     if btc_base_price:
-        for symbol, price in tickers.items():
-            if symbol.endswith("BTC"):
-                asset = symbol[:-3]  # Remove BTC suffix
-                if asset not in prices:  # Don't override existing mappings
-                    prices[asset] = price * btc_base_price
+        prices.update([
+            (symbol[:-3], price * btc_base_price) for symbol, price in items
+            if symbol.endswith("BTC") and symbol[:-3] not in prices
+        ])
     
     return prices
 
 
+_detect_primary_fiat_currency_memo = _IdentityMemo(_detect_primary_fiat_currency)
+_build_price_map_memo = _IdentityMemo(_build_price_map)
+
+
 def get_asset_price(asset: str, price_map: Dict[str, float]) -> Optional[float]:
     """Get price for a specific asset in the base currency.
     
@@ -128,15 +230,19 @@ def calculate_portfolio_value(balances: Dict[str, float], price_map: Dict[str, f
     Returns:
         Total portfolio value in base currency
     """
+    # Balances are a few dozen assets, where a NumPy gather/dot measured slower than this loop
+    base_currency = base_currency.upper()
+    price_of = price_map.get
     total_value = 0.0
     
     for asset, amount in balances.items():
         if amount > 0:
+            asset = asset.upper()
             # Handle base currency (1:1 conversion)
-            if asset.upper() == base_currency.upper():
+            if asset == base_currency:
                 total_value += amount
             else:
-                price = get_asset_price(asset, price_map)
+                price = price_of(asset)
                 if price:
                     total_value += amount * price
     
@@ -1,72 +1,240 @@
 """Simple JSON-based data manager for purchases, balances, and prices."""
+import bisect
 import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
+import numpy as np
+from .currency import scan_transactions
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Purchase fields holding a handful of distinct values (currency codes, methods, types).
+# Interning them after parsing makes every record share one string per value.
+_INTERNED_FIELDS = ('originalCurrency', 'fiatCurrency', 'cryptoCurrency', 'paymentMethod', 'transactionType', 'endpoint')
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize JSON as UTF-8 bytes (compact, or 2-space indented), preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2) if indent else orjson.dumps(obj)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class JSONDataManager:
     """Manages data storage using simple JSON files instead of SQLite database."""
     
+    # Purchase count above which get_purchase_statistics aggregates with NumPy
+    STATS_VECTORIZE_THRESHOLD = 64
+    
     def __init__(self, data_dir: Path):
         """Initialize data manager with data directory."""
         self.data_dir = data_dir
         self.data_dir.mkdir(exist_ok=True)
         
         # Define file paths
-        self.purchases_file = self.data_dir / "purchases.json"
+        # Purchases are an append-only log with one JSON record per line
+        self.purchases_file = self.data_dir / "purchases.jsonl"
+        self.legacy_purchases_file = self.data_dir / "purchases.json"
         self.balances_file = self.data_dir / "balances.json"
         self.prices_file = self.data_dir / "prices.json"
         
+        # Order IDs already in the log, loaded on first save
+        self._order_ids: Optional[Set[str]] = None
+        
+        # Parsed file contents keyed by path, valid while (st_mtime_ns, st_size) is unchanged.
+        # Returned objects are shared between callers and must be treated as read-only.
+        self._cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+        
+        # Purchases ordered newest first, with a parallel ascending list of -createTime for bisect.
+        # Valid for the log list object in _sorted_source; appends are inserted in place.
+        self._sorted_source: Optional[List[Dict[str, Any]]] = None
+        self._sorted_purchases: List[Dict[str, Any]] = []
+        self._sorted_keys: List[int] = []
+        
         # Initialize empty files if they don't exist
-        for file_path in [self.purchases_file, self.balances_file, self.prices_file]:
+        for file_path in [self.balances_file, self.prices_file]:
             if not file_path.exists():
                 self._save_json(file_path, [])
+        if not self.purchases_file.exists():
+            if self.legacy_purchases_file.exists():
+                self.migrate_purchase_data()
+            else:
+                self.purchases_file.touch()
+    
+    @staticmethod
+    def _file_key(file_path: Path) -> Optional[Tuple[int, int]]:
+        """Modification time and size identifying the current file contents, or None if missing."""
+        try:
+            st = file_path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _cached(self, file_path: Path, key: Optional[Tuple[int, int]]) -> Any:
+        """Return the cached parse of file_path if it was made for key, else None."""
+        entry = self._cache.get(file_path)
+        if entry is not None and key is not None and entry[0] == key:
+            return entry[1]
+        return None
     
     def _load_json(self, file_path: Path) -> Any:
-        """Load JSON data from file."""
+        """Load JSON data from file, reusing the last parse while the file is unchanged."""
+        key = self._file_key(file_path)
+        data = self._cached(file_path, key)
+        if data is not None:
+            return data
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            with open(file_path, 'rb') as f:
+                data = _loads(f.read())
+        except (FileNotFoundError, ValueError):
             return []
+        if key is not None:
+            self._cache[file_path] = (key, data)
+        return data
     
     def _save_json(self, file_path: Path, data: Any) -> None:
-        """Save JSON data to file."""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """Save JSON data to file (indented; these small files are meant to be readable).
+        
+        Written to a temp file and renamed over the target, so a crash never leaves it truncated.
+        """
+        temp_file = file_path.with_suffix(file_path.suffix + '.tmp')
+        with open(temp_file, 'wb', buffering=1 << 20) as f:
+            f.write(_dumps(data, indent=True))
+        os.replace(temp_file, file_path)
+        
+        # Cache what was just written instead of re-parsing it on the next load
+        key = self._file_key(file_path)
+        if key is not None:
+            self._cache[file_path] = (key, data)
+    
+    def _load_purchase_log(self) -> List[Dict[str, Any]]:
+        """Return purchases from the log in the order they were saved (cached while unchanged).
+        
+        The log is decoded one line at a time, so the raw file is never held in memory
+        as a whole document alongside the parsed records.
+        """
+        key = self._file_key(self.purchases_file)
+        purchases = self._cached(self.purchases_file, key)
+        if purchases is not None:
+            return purchases
+        
+        purchases = []
+        intern = sys.intern
+        try:
+            with open(self.purchases_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        purchase = _loads(line)
+                        for field in _INTERNED_FIELDS:
+                            value = purchase.get(field)
+                            if type(value) is str:
+                                purchase[field] = intern(value)
+                        purchases.append(purchase)
+        except FileNotFoundError:
+            return purchases
+        if key is not None:
+            self._cache[self.purchases_file] = (key, purchases)
+        return purchases
+    
+    def _append_purchases(self, purchases: List[Dict[str, Any]]) -> None:
+        """Append records to the purchases log in one buffered write."""
+        if not purchases:
+            return
+        key_before = self._file_key(self.purchases_file)
+        cached = self._cached(self.purchases_file, key_before)
+        
+        lines = [_dumps(p) + b'\n' for p in purchases]
+        with open(self.purchases_file, 'ab', buffering=1 << 20) as f:
+            f.write(b''.join(lines))
+        
+        # If the cache matched the file before the append, extend it rather than dropping it
+        if cached is not None:
+            key = self._file_key(self.purchases_file)
+            if key is not None:
+                extended = cached + purchases
+                self._cache[self.purchases_file] = (key, extended)
+                if self._sorted_source is cached:
+                    self._insert_sorted(purchases)
+                    self._sorted_source = extended
+    
+    def _insert_sorted(self, purchases: List[Dict[str, Any]]) -> None:
+        """Insert purchases into the newest-first view, after any with an equal createTime."""
+        for purchase in purchases:
+            key = -purchase.get('createTime', 0)
+            index = bisect.bisect_right(self._sorted_keys, key)
+            self._sorted_keys.insert(index, key)
+            self._sorted_purchases.insert(index, purchase)
     
     def save_purchases(self, purchases: List[Dict[str, Any]]) -> int:
-        """Save purchases to JSON file, handling duplicates."""
-        existing_purchases = self._load_json(self.purchases_file)
+        """Append new purchases to the log, skipping order IDs that are already saved.
         
-        # Create a set of existing order IDs for quick lookup
-        existing_order_ids = {p.get('orderId') for p in existing_purchases if p.get('orderId')}
+        Only the new records are written, so a save costs O(new) instead of
+        rewriting the whole history.
+        """
+        if self._order_ids is None:
+            self._order_ids = {p['orderId'] for p in self._load_purchase_log() if p.get('orderId')}
+        existing_order_ids = self._order_ids
         
-        # Add new purchases that don't already exist
-        new_count = 0
+        # Add new purchases that don't already exist, stamped with one shared save time
+        saved_at = datetime.now().isoformat()
+        new_purchases = []
         for purchase in purchases:
             order_id = purchase.get('orderId')
             if order_id and order_id not in existing_order_ids:
-                # Add timestamp for when we saved it
-                purchase['savedAt'] = datetime.now().isoformat()
-                existing_purchases.append(purchase)
+                purchase['savedAt'] = saved_at
+                new_purchases.append(purchase)
                 existing_order_ids.add(order_id)
-                new_count += 1
-        
-        # Sort by createTime (newest first)
-        existing_purchases.sort(key=lambda x: x.get('createTime', 0), reverse=True)
         
-        self._save_json(self.purchases_file, existing_purchases)
-        return new_count
+        self._append_purchases(new_purchases)
+        return len(new_purchases)
     
     def get_purchases(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Retrieve purchases from JSON file."""
-        purchases = self._load_json(self.purchases_file)
+        """Retrieve purchases sorted by createTime (newest first).
+        
+        The sorted order is built once per loaded log and kept up to date as purchases
+        are saved, so repeated calls only copy the list.
+        """
+        log = self._load_purchase_log()
+        if self._sorted_source is not log:
+            self._sorted_purchases = sorted(log, key=lambda p: p.get('createTime', 0), reverse=True)
+            self._sorted_keys = [-p.get('createTime', 0) for p in self._sorted_purchases]
+            self._sorted_source = log
         
         if limit:
-            return purchases[:limit]
-        return purchases
+            return self._sorted_purchases[:limit]
+        return list(self._sorted_purchases)
+    
+    def prefetch(self) -> None:
+        """Load purchases, balances and prices in parallel threads to warm the cache.
+        
+        The three file reads overlap instead of running back to back on the first
+        UI refresh. Returns once all three are cached.
+        """
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="data-prefetch") as executor:
+            futures = [
+                executor.submit(self._load_purchase_log),
+                executor.submit(self._load_json, self.balances_file),
+                executor.submit(self._load_json, self.prices_file),
+            ]
+            for future in futures:
+                future.result()
     
     def save_spot_balances(self, balances: Dict[str, Dict[str, float]]) -> int:
         """Save spot balances to JSON file."""
@@ -114,7 +282,9 @@ class JSONDataManager:
         counts['prices'] = len(prices)
         
         # Clear all files
-        self._save_json(self.purchases_file, [])
+        with open(self.purchases_file, 'wb'):
+            pass
+        self._order_ids = set()
         self._save_json(self.balances_file, {})
         self._save_json(self.prices_file, {})
         
@@ -133,25 +303,33 @@ class JSONDataManager:
             }
         
         # Extract statistics
-        currencies = set()
-        payment_methods = set()
-        amounts = []
-        timestamps = []
-        
-        for purchase in purchases:
-            if 'originalCurrency' in purchase:
-                currencies.add(purchase['originalCurrency'])
-            if 'paymentMethod' in purchase:
-                payment_methods.add(purchase['paymentMethod'])
-            if 'amountFiat' in purchase:
-                amounts.append(purchase['amountFiat'])
-            if 'createTime' in purchase and purchase['createTime']:
-                timestamps.append(purchase['createTime'])
+        if len(purchases) < self.STATS_VECTORIZE_THRESHOLD:
+            scan = scan_transactions(purchases)
+            currencies = scan['currencies']
+            payment_methods = scan['payment_methods']
+            amount_count = scan['amount_count']
+            total_amount = scan['amount_total']
+            ts_range = (scan['min_ts'], scan['max_ts']) if scan['min_ts'] is not None else None
+        else:
+            # Large histories: aggregate the numeric columns as arrays
+            currencies = {p['originalCurrency'] for p in purchases if 'originalCurrency' in p}
+            payment_methods = {p['paymentMethod'] for p in purchases if 'paymentMethod' in p}
+            # Same filter as scan_transactions: a stored null amount is skipped, not counted
+            amounts = np.fromiter(
+                (amount for amount in (p.get('amountFiat') for p in purchases) if amount is not None),
+                dtype=np.float64
+            )
+            timestamps = np.fromiter(
+                (p.get('createTime') or 0 for p in purchases), dtype=np.int64, count=len(purchases)
+            )
+            timestamps = timestamps[timestamps != 0]
+            amount_count = len(amounts)
+            total_amount = float(amounts.sum()) if amount_count else 0
+            ts_range = (int(timestamps.min()), int(timestamps.max())) if len(timestamps) else None
         
         date_range = None
-        if timestamps:
-            min_ts = min(timestamps)
-            max_ts = max(timestamps)
+        if ts_range:
+            min_ts, max_ts = ts_range
             date_range = {
                 'earliest': datetime.fromtimestamp(min_ts / 1000).isoformat(),
                 'latest': datetime.fromtimestamp(max_ts / 1000).isoformat()
@@ -162,11 +340,28 @@ class JSONDataManager:
             'date_range': date_range,
             'currencies': sorted(list(currencies)),
             'payment_methods': sorted(list(payment_methods)),
-            'total_amount_eur': sum(amounts) if amounts else 0,
-            'average_amount_eur': sum(amounts) / len(amounts) if amounts else 0
+            'total_amount_eur': total_amount,
+            'average_amount_eur': total_amount / amount_count if amount_count else 0
         }
     
     def migrate_purchase_data(self) -> int:
-        """Migrate existing purchase data (placeholder for compatibility)."""
-        # This was used for database migration, not needed for JSON
-        return 0
+        """Move purchases from the old single-document purchases.json into the log.
+        
+        The old file is kept as purchases.json.bak. Returns the number of migrated records.
+        """
+        if not self.legacy_purchases_file.exists():
+            return 0
+        
+        legacy_purchases = self._load_json(self.legacy_purchases_file)
+        if not isinstance(legacy_purchases, list):
+            legacy_purchases = []
+        
+        # Write the log under a temp name first so a failed migration is retried next start
+        temp_file = self.purchases_file.with_suffix('.jsonl.tmp')
+        with open(temp_file, 'wb', buffering=1 << 20) as f:
+            for purchase in legacy_purchases:
+                f.write(_dumps(purchase) + b'\n')
+        os.replace(temp_file, self.purchases_file)
+        os.replace(self.legacy_purchases_file, self.legacy_purchases_file.with_suffix('.json.bak'))
+        self._order_ids = None
+        return len(legacy_purchases)
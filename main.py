@@ -1,10 +1,14 @@
 """Main application entry point for Binance Full Deposit History Tool."""
 import sys
-import traceback
-import subprocess
+from importlib.metadata import PackageNotFoundError, distribution
 from pathlib import Path
 
 
+def is_console() -> bool:
+    """True when stdout is an interactive console (not a windowed or bundled launch)."""
+    return sys.stdout is not None and sys.stdout.isatty()
+
+
 def setup_application():
     """Set up the Qt application with proper styling."""
     from PySide6.QtWidgets import QApplication
@@ -43,28 +47,33 @@ def show_error_dialog(title: str, message: str, details: str = None):
 
 def check_and_install_dependencies():
     """Check if all required dependencies are installed, install if missing."""
-    print("🔍 Checking dependencies...")
+    # Bundled builds ship their dependencies and have no pip to install with
+    if getattr(sys, 'frozen', False):
+        return True
+    
+    if is_console():
+        print("🔍 Checking dependencies...")
     
+    # Distribution name -> requirement; checked from installed metadata without importing anything
     required_packages = {
         'httpx': 'httpx>=0.25.0',
         'PySide6': 'PySide6>=6.6.0',
-        'pydantic': 'pydantic>=2.5.0',
-        'dotenv': 'python-dotenv>=1.0.0',
-        'tenacity': 'tenacity>=8.2.0',
-        'dateutil': 'python-dateutil>=2.8.0',
+        'python-dotenv': 'python-dotenv>=1.0.0',
+        'python-dateutil': 'python-dateutil>=2.8.0',
         'pyqtgraph': 'pyqtgraph>=0.13.0',
         'numpy': 'numpy>=1.24.0'
     }
     
     missing_packages = []
     
-    for import_name, package_spec in required_packages.items():
+    for dist_name, package_spec in required_packages.items():
         try:
-            __import__(import_name)
-        except ImportError:
+            distribution(dist_name)
+        except PackageNotFoundError:
             missing_packages.append(package_spec)
     
     if missing_packages:
+        import subprocess
         print(f"⚠️  Missing packages: {', '.join(missing_packages)}")
         print("🔧 Installing missing dependencies...")
         
@@ -86,16 +95,22 @@ def check_and_install_dependencies():
             print("Please manually run: pip install -r requirements.txt")
             return False
     else:
-        print("✅ All dependencies are available.")
+        if is_console():
+            print("✅ All dependencies are available.")
         return True
 
 def show_startup_info():
-    """Show application startup information."""
-    print("" + "="*60)
-    print("📈 Binance Full Deposit History Tool v1.0")
-    print("" + "="*60)
-    print(f"🐍 Python {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}")
-    print(f"📂 Working Directory: {Path.cwd()}")
+    """Show application startup information (console launches only, in a single write)."""
+    if not is_console():
+        return
+    lines = [
+        "=" * 60,
+        "📈 Binance Full Deposit History Tool v1.0",
+        "=" * 60,
+        f"🐍 Python {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
+        f"📂 Working Directory: {Path.cwd()}",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -117,7 +132,8 @@ def main():
         input("Press Enter to exit...")
         sys.exit(1)
     
-    print("🚀 Starting application...")
+    if is_console():
+        print("🚀 Starting application...")
     
     # Import after dependency check
     try:
@@ -156,10 +172,9 @@ def main():
             else:
                 raise e
         
-        # Initialize JSON data manager
-        data_dir = app_dir / "data"
-        data_dir.mkdir(exist_ok=True)
-        data_manager = JSONDataManager(data_dir)
+        # Initialize JSON data manager (it creates the data directory) and load its files up front
+        data_manager = JSONDataManager(app_dir / "data")
+        data_manager.prefetch()
         
         # Create and show main window
         main_window = MainWindow(data_manager, app_dir)
@@ -173,6 +188,7 @@ def main():
         sys.exit(app.exec())
         
     except Exception as e:
+        import traceback
         error_details = traceback.format_exc()
         show_error_dialog(
             "Application Error",
@@ -12,7 +12,7 @@ if errorlevel 1 (
 )
 
 REM Check if requirements are installed
-python -c "import httpx, pydantic, dotenv, tenacity, pyqtgraph" >nul 2>&1
+python -c "import httpx, dotenv, pyqtgraph" >nul 2>&1
 if errorlevel 1 (
     echo Installing required packages...
     pip install -r requirements.txt
@@ -160,6 +160,212 @@ def test_data_manager():
         print(f"  ❌ Data manager test failed: {e}")
         return False
 
+def test_purchase_log_migration():
+    """Test moving purchases.json into the purchases.jsonl log, appends, caching and dedup."""
+    print("🧪 Testing purchase log migration...")
+    
+    try:
+        from core.json_data_manager import JSONDataManager
+        import json
+        import tempfile
+        import shutil
+        
+        temp_dir = Path(tempfile.mkdtemp())
+        
+        try:
+            # Old single-document format
+            legacy_purchases = [
+                {'orderId': 'OLD001', 'createTime': 1640995200000, 'transactionType': '0', 'amountFiat': 100.0},
+                {'orderId': 'OLD002', 'createTime': 1641081600000, 'transactionType': '1', 'amountFiat': 40.0}
+            ]
+            with open(temp_dir / "purchases.json", 'w', encoding='utf-8') as f:
+                json.dump(legacy_purchases, f)
+            
+            # Migration runs on startup when there is no log yet
+            manager = JSONDataManager(temp_dir)
+            log_lines = (temp_dir / "purchases.jsonl").read_text(encoding='utf-8').splitlines()
+            if (len(log_lines) == 2 and (temp_dir / "purchases.json.bak").exists()
+                    and not (temp_dir / "purchases.json").exists()):
+                print("  ✅ purchases.json migrated to purchases.jsonl (old file kept as .bak)")
+            else:
+                print(f"  ❌ Migration failed: {log_lines}")
+                return False
+            
+            if manager.migrate_purchase_data() != 0:
+                print("  ❌ Second migration should find nothing to move")
+                return False
+            
+            purchases = manager.get_purchases()
+            if [p['orderId'] for p in purchases] != ['OLD002', 'OLD001']:
+                print(f"  ❌ Migrated purchases not loaded newest first: {purchases}")
+                return False
+            
+            # Appends write only new order IDs
+            saved_count = manager.save_purchases([
+                {'orderId': 'OLD001', 'createTime': 1640995200000, 'transactionType': '0', 'amountFiat': 100.0},
+                {'orderId': 'NEW001', 'createTime': 1641168000000, 'transactionType': '0', 'amountFiat': 25.0}
+            ])
+            log_lines = (temp_dir / "purchases.jsonl").read_text(encoding='utf-8').splitlines()
+            if saved_count == 1 and len(log_lines) == 3 and manager.get_purchases()[0]['orderId'] == 'NEW001':
+                print("  ✅ Appending skips existing order IDs")
+            else:
+                print(f"  ❌ Append failed: saved {saved_count}, {len(log_lines)} lines")
+                return False
+            
+            # The cached log is keyed on the file's (mtime, size), so an outside write is picked up
+            stat = manager.purchases_file.stat()
+            if manager._file_key(manager.purchases_file) != (stat.st_mtime_ns, stat.st_size):
+                print("  ❌ Cache key is not (st_mtime_ns, st_size)")
+                return False
+            other = JSONDataManager(temp_dir)
+            other.save_purchases([
+                {'orderId': 'NEW002', 'createTime': 1641254400000, 'transactionType': '0', 'amountFiat': 10.0}
+            ])
+            if len(manager.get_purchases()) == 4:
+                print("  ✅ Cached log refreshed after the file changed")
+            else:
+                print(f"  ❌ Stale cache: {len(manager.get_purchases())} purchases")
+                return False
+            
+            # A fresh manager loads the saved order IDs from the log and dedups against them
+            fresh = JSONDataManager(temp_dir)
+            if fresh.save_purchases(legacy_purchases) == 0 and len(fresh.get_purchases()) == 4:
+                print("  ✅ Duplicate order IDs are not saved again")
+            else:
+                print("  ❌ Dedup by order ID failed")
+                return False
+            
+            return True
+            
+        finally:
+            # Clean up
+            shutil.rmtree(temp_dir)
+        
+    except Exception as e:
+        print(f"  ❌ Purchase log migration test failed: {e}")
+        return False
+
+def test_purchase_statistics_branches():
+    """Test that the scan and NumPy branches of get_purchase_statistics agree."""
+    print("🧪 Testing purchase statistics branches...")
+    
+    try:
+        from core.json_data_manager import JSONDataManager
+        import tempfile
+        import shutil
+        
+        temp_dir = Path(tempfile.mkdtemp())
+        
+        try:
+            manager = JSONDataManager(temp_dir)
+            
+            # Amounts are multiples of 0.25 so both summation orders are exact
+            purchases = []
+            for i in range(80):
+                purchase = {'orderId': f'STAT{i:03d}', 'transactionType': '0'}
+                if i % 7:
+                    purchase['createTime'] = 1640995200000 + i * 86400000
+                if i % 5 == 0:
+                    purchase['amountFiat'] = None  # Valid stored data: amount unknown
+                elif i % 11:
+                    purchase['amountFiat'] = 10.0 + i * 0.25
+                if i % 3 == 0:
+                    purchase['originalCurrency'] = ('EUR', 'USD', 'GBP')[i % 9 // 3]
+                if i % 4 == 0:
+                    purchase['paymentMethod'] = 'Card' if i % 8 else 'Bank'
+                purchases.append(purchase)
+            manager.save_purchases(purchases)
+            
+            manager.STATS_VECTORIZE_THRESHOLD = 10 ** 9  # Force scan_transactions
+            scan_stats = manager.get_purchase_statistics()
+            manager.STATS_VECTORIZE_THRESHOLD = 0  # Force the NumPy branch
+            numpy_stats = manager.get_purchase_statistics()
+            
+            if scan_stats == numpy_stats and scan_stats['total_count'] == 80:
+                print(f"  ✅ Both branches agree: €{scan_stats['total_amount_eur']:.2f} over {scan_stats['total_count']} records")
+            else:
+                print(f"  ❌ Branches disagree:\n    scan:  {scan_stats}\n    numpy: {numpy_stats}")
+                return False
+            
+            return True
+            
+        finally:
+            # Clean up
+            shutil.rmtree(temp_dir)
+        
+    except Exception as e:
+        print(f"  ❌ Purchase statistics test failed: {e}")
+        return False
+
+def test_fx_rates():
+    """Test ECB CSV parsing and the FX rate lookup with weekend fallback."""
+    print("🧪 Testing FX rate cache...")
+    
+    try:
+        from api.fx_rates import FxRateCache
+        from datetime import datetime, timezone
+        import io
+        import json
+        import tempfile
+        import shutil
+        import zipfile
+        
+        # ECB layout: units of each currency per EUR, newest row first, N/A where there was no fixing
+        csv_text = (
+            "Date,USD,GBP,CYP,\n"
+            "2024-01-05,1.25,0.8,N/A,\n"
+            "2024-01-04,1.0,N/A,N/A,\n"
+        )
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr("eurofxref-hist.csv", csv_text)
+        table = FxRateCache._parse_ecb_zip(buffer.getvalue())
+        
+        expected = {'USD': {'20240105': 0.8, '20240104': 1.0}, 'GBP': {'20240105': 1.25}}
+        if table == expected:
+            print("  ✅ ECB zip parsed, N/A cells skipped, rates inverted to EUR per unit")
+        else:
+            print(f"  ❌ ECB zip parsing failed: {table}")
+            return False
+        
+        temp_dir = Path(tempfile.mkdtemp())
+        
+        try:
+            cache_path = temp_dir / "fx_rates.json"
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(table, f)
+            cache = FxRateCache(cache_path)
+            
+            def noon_utc(year, month, day):
+                return int(datetime(year, month, day, 12, tzinfo=timezone.utc).timestamp() * 1000)
+            
+            # Saturday 2024-01-06 has no fixing: Friday's rate is used
+            if cache.rate('USD', noon_utc(2024, 1, 5)) == 0.8 and cache.rate('USD', noon_utc(2024, 1, 6)) == 0.8:
+                print("  ✅ Weekend falls back to the previous business day")
+            else:
+                print(f"  ❌ Weekend fallback failed: {cache.rate('USD', noon_utc(2024, 1, 6))}")
+                return False
+            
+            # Beyond MAX_FALLBACK_DAYS, and before the first fixing, the rate is unknown
+            too_late = 5 + FxRateCache.MAX_FALLBACK_DAYS + 1
+            if (cache.rate('USD', noon_utc(2024, 1, too_late)) is None
+                    and cache.rate('USD', noon_utc(2024, 1, 3)) is None
+                    and cache.rate('JPY', noon_utc(2024, 1, 5)) is None):
+                print(f"  ✅ No rate past {FxRateCache.MAX_FALLBACK_DAYS} fallback days or for unknown currencies")
+            else:
+                print(f"  ❌ Stale fallback returned a rate: {cache.rate('USD', noon_utc(2024, 1, too_late))}")
+                return False
+            
+            return True
+            
+        finally:
+            # Clean up
+            shutil.rmtree(temp_dir)
+        
+    except Exception as e:
+        print(f"  ❌ FX rate test failed: {e}")
+        return False
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -171,6 +377,9 @@ def main():
         ("Chart Widget Creation", test_chart_widget_creation),
         ("Currency Functions", test_currency_functions),
         ("Data Manager", test_data_manager),
+        ("Purchase Log Migration", test_purchase_log_migration),
+        ("Purchase Statistics", test_purchase_statistics_branches),
+        ("FX Rates", test_fx_rates),
     ]
     
     passed = 0
@@ -1,10 +1,137 @@
 """Chart widget for displaying investment data."""
+import bisect
+import functools
+import logging
+import weakref
 from typing import List, Dict, Any
 from datetime import datetime
+
+import numpy as np
+import pyqtgraph as pg
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QItemSelection, QItemSelectionModel
 from PySide6.QtGui import QFont
 
+try:
+    from tsdownsample import LTTBDownsampler
+except ImportError:
+    LTTBDownsampler = None
+
+logger = logging.getLogger(__name__)
+
+# Line series longer than this are reduced with LTTB to _LTTB_POINTS before plotting
+_LTTB_THRESHOLD = 1500
+_LTTB_POINTS = 1000
+
+# Pens and brushes shared by every chart rebuild
+_PORTFOLIO_PEN = pg.mkPen(color='#2E86AB', width=3, cosmetic=True)
+_NET_INVESTMENT_PEN = pg.mkPen(color='#87CEEB', width=1, style=Qt.DashLine, cosmetic=True)
+_PROFIT_PEN = pg.mkPen(color='#27AE60', width=1, style=Qt.SolidLine, cosmetic=True)  # Net P/L >= 0
+_LOSS_PEN = pg.mkPen(color='#E74C3C', width=1, style=Qt.DashLine, cosmetic=True)  # Net P/L < 0
+_WALLET_PEN = pg.mkPen(color='#F1C40F', width=4, style=Qt.SolidLine)
+_ZERO_PEN = pg.mkPen(color='#2C3E50', width=2, style=Qt.SolidLine)  # Dark blue-gray, thick line
+_BUY_BRUSH = pg.mkBrush(color=(46, 204, 113, 220))  # Green for buys
+_BUY_PEN = pg.mkPen(color='#27AE60', width=2)
+_SELL_BRUSH = pg.mkBrush(color=(231, 76, 60, 220))  # Red for sells
+_SELL_PEN = pg.mkPen(color='#C0392B', width=2)
+_LEGEND_BRUSH = pg.mkBrush(color=(255, 255, 255, 200))  # White background with transparency
+_LEGEND_PEN = pg.mkPen(color=(0, 0, 0), width=1)  # Black border
+
+# Direction markers for transaction lines in the click summary
+_ARROWS = {'BUY': '↑', 'SELL': '↓'}
+
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_day(timestamp: float) -> str:
+    """Local date of a timestamp in seconds, cached across chart refreshes."""
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_minute(timestamp: float) -> str:
+    """Local date and time (to the minute) of a timestamp in seconds, cached across chart refreshes."""
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+    
+    Args:
+        x: Monotonic x values
+        y: Y values, same length as x
+        n_out: Number of points to keep (first and last are always kept)
+        
+    Returns:
+        Sorted index array into x/y
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    if LTTBDownsampler is not None:
+        return LTTBDownsampler().downsample(x, y, n_out=n_out)
+    
+    # Interior points split into n_out - 2 buckets; keep the point of each bucket forming the
+    # largest triangle with the previously kept point and the next bucket's average
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    out = np.empty(n_out, dtype=np.intp)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            avg_x = x[hi:edges[i + 2]].mean()
+            avg_y = y[hi:edges[i + 2]].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+class ClickableBarGraphItem(pg.BarGraphItem):
+    """One side's bars (buys or sells), one bar per day; clicks and hovers resolve the day from x.
+    
+    chart_widget, day_timestamps and trans_type are set by the chart after construction.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chart_widget = None
+        self.day_timestamps = []  # Sorted bar centers
+        self.trans_type = 'BUY'
+        self._hover_day = None
+        self.setAcceptHoverEvents(True)
+    
+    def _day_at(self, x):
+        # Bars are one day wide and centered on their day timestamp
+        i = bisect.bisect_right(self.day_timestamps, x + 43200) - 1
+        if i >= 0 and x < self.day_timestamps[i] + 43200:
+            return self.day_timestamps[i]
+        return None
+    
+    def mouseClickEvent(self, ev):
+        day_timestamp = self._day_at(ev.pos().x())
+        if ev.button() == Qt.LeftButton and self.chart_widget and day_timestamp:
+            logger.debug("Bar clicked for day: %s", _fmt_day(day_timestamp))
+            self.chart_widget._on_transaction_clicked(day_timestamp)
+        
+        # Call parent class method if it exists
+        if hasattr(pg.BarGraphItem, 'mouseClickEvent'):
+            pg.BarGraphItem.mouseClickEvent(self, ev)
+    
+    def hoverEvent(self, ev):
+        # Format the tooltip only when the cursor moves onto another day
+        day_timestamp = None if ev.isExit() else self._day_at(ev.pos().x())
+        if day_timestamp == self._hover_day:
+            return
+        self._hover_day = day_timestamp
+        if day_timestamp is None or not self.chart_widget:
+            self.setToolTip("")
+        else:
+            self.setToolTip(self.chart_widget._bar_tooltip(day_timestamp, self.trans_type))
+
 
 class ChartWidget(QWidget):
     """Simple chart widget for displaying purchase/investment data."""
@@ -14,13 +141,20 @@ class ChartWidget(QWidget):
         self.plot_widget = None
         self.title_label = None
         self.purchase_data = {}  # Store purchase data by timestamp for tooltips
+        self._purchases_sorted = []  # purchase_data refers to transactions by index into this list
+        self._line_series = []  # [curve, name, full x, full y, plotted window] for LTTB-reduced lines
+        self._current_portfolio_value = 0.0  # Set by the main window whenever balances change
+        self._last_key = None  # Inputs of the last rebuild; update_chart_data skips when unchanged
+        self._pending_purchases = None  # Latest data received while hidden, drawn on the next show
         self.main_window = parent  # Reference to main window for table highlighting
+        self._table_window_ref = None  # weakref to the ancestor holding purchases_table, found on first click
         self._init_ui()
     
     def _init_ui(self):
         """Initialize the user interface."""
         try:
-            import pyqtgraph as pg
+            # Bars and polylines gain little from antialiasing, which roughly doubles draw cost on high-DPI screens
+            pg.setConfigOptions(antialias=False, useOpenGL=False)
             
             # Create main container frame matching other sections
             from PySide6.QtWidgets import QFrame, QSizePolicy
@@ -58,10 +192,17 @@ class ChartWidget(QWidget):
             
             # Create plot widget with time axis
             self.plot_widget = pg.PlotWidget()
+            # The viewport paints every pixel itself, so Qt can skip erasing it first
+            self.plot_widget.viewport().setAttribute(Qt.WA_OpaquePaintEvent, True)
             self.plot_widget.setLabel('left', 'Amount (EUR)', color='black', size='10pt')
             self.plot_widget.setLabel('bottom', 'Time', color='black', size='10pt')
             self.plot_widget.showGrid(x=True, y=True, alpha=0.5)  # 50% opacity grid
             
+            # Decimate curves to one min/max pair per pixel column and skip points outside the view;
+            # the plot item applies this to every curve added later
+            self.plot_widget.setDownsampling(auto=True, mode='peak')
+            self.plot_widget.setClipToView(True)
+            
             # Optimize sizing for maximum chart visibility on laptop screens
             self.plot_widget.setMinimumHeight(280)  # Further reduced for compactness
             self.plot_widget.setMinimumWidth(380)   # Slightly smaller minimum width
@@ -93,7 +234,7 @@ class ChartWidget(QWidget):
                 plot_item.getAxis('left').setStyle(tickTextOffset=3)  # Reduce tick offset
                 plot_item.getAxis('bottom').setStyle(tickTextOffset=3)
             except Exception as e:
-                print(f"Warning: Could not configure axis sizes: {e}")
+                logger.warning("Could not configure axis sizes: %s", e)
             
             # Add plot widget directly to container
             container_layout.addWidget(self.plot_widget)
@@ -106,6 +247,9 @@ class ChartWidget(QWidget):
             time_axis = pg.DateAxisItem(orientation='bottom')
             self.plot_widget.setAxisItems({'bottom': time_axis})
             
+            # Plot items are created once and only get new data on each update
+            self._create_chart_items()
+            
             # Connect to view range change to enforce Y-axis minimum at 0
             view_box = self.plot_widget.getViewBox()
             view_box.sigRangeChanged.connect(self._on_view_range_changed)
@@ -120,16 +264,86 @@ class ChartWidget(QWidget):
             label.setAlignment(Qt.AlignCenter)
             layout.addWidget(label)
     
+    def _create_chart_items(self):
+        """Create the persistent curves, lines, bars and legend that update_chart_data fills."""
+        self._legend = self.plot_widget.addLegend()
+        self._legend.setParentItem(self.plot_widget.getPlotItem())
+        
+        # Style the legend for better visibility
+        try:
+            # Set legend properties for better visibility
+            self._legend.setBrush(_LEGEND_BRUSH)
+            self._legend.setPen(_LEGEND_PEN)
+            self._legend.setOffset((10, 10))  # Position offset from top-left
+            
+            # Try to set text style if supported
+            if hasattr(self._legend, 'setLabelTextColor'):
+                self._legend.setLabelTextColor((0, 0, 0))  # Black text
+            
+        except Exception as e:
+            logger.warning("Legend styling failed: %s", e)
+        
+        # Lines: portfolio value (BLUE), net investment (light blue), net P/L (GREEN/RED)
+        self._portfolio_curve = self.plot_widget.plot(pen=_PORTFOLIO_PEN)
+        self._net_curve = self.plot_widget.plot(pen=_NET_INVESTMENT_PEN)
+        self._pl_curve = self.plot_widget.plot(pen=_PROFIT_PEN)
+        
+        # Current wallet amount (YELLOW horizontal line); the label follows the line position
+        self._current_line = pg.InfiniteLine(
+            angle=0,  # Horizontal line
+            pen=_WALLET_PEN,
+            label='Current Wallet: €{value:.0f}',
+            labelOpts={'position': 0.1, 'color': '#F1C40F', 'fill': '#F1C40F'}
+        )
+        self.plot_widget.addItem(self._current_line)
+        
+        # Prominent horizontal zero line (CRITICAL for buy/sell separation)
+        self._zero_line = pg.InfiniteLine(
+            pos=0,  # At Y = 0 EUR
+            angle=0,  # Horizontal line
+            pen=_ZERO_PEN,
+            label='€0 (Buy/Sell Separator)',
+            labelOpts={'position': 0.95, 'color': '#2C3E50', 'fill': (44, 62, 80, 100)}
+        )
+        self.plot_widget.addItem(self._zero_line)
+        
+        # Interactive Buy bars (GREEN, above zero) and Sell bars (RED, below zero), one item per side
+        self._buy_bars = ClickableBarGraphItem(x=[], height=[], width=86400, brush=_BUY_BRUSH, pen=_BUY_PEN)
+        self._buy_bars.chart_widget = self
+        self._buy_bars.trans_type = 'BUY'
+        self._sell_bars = ClickableBarGraphItem(x=[], height=[], width=86400, brush=_SELL_BRUSH, pen=_SELL_PEN)
+        self._sell_bars.chart_widget = self
+        self._sell_bars.trans_type = 'SELL'
+        self.plot_widget.addItem(self._buy_bars)
+        self.plot_widget.addItem(self._sell_bars)
+        
+        self.clear_chart()
+    
     def clear_chart(self):
         """Clear all data from the chart."""
         if self.plot_widget:
-            self.plot_widget.clear()
+            for curve in (self._portfolio_curve, self._net_curve, self._pl_curve):
+                self._set_line(curve, None)
+            for item in (self._current_line, self._zero_line, self._buy_bars, self._sell_bars, self._legend):
+                item.hide()
+            self.plot_widget.viewport().update()
+        self._last_key = None
     
     def set_chart_title(self, title: str):
         """Set the chart title."""
         if self.title_label:
             self.title_label.setText(title)
     
+    def showEvent(self, event):
+        """Draw data that arrived while the chart was hidden."""
+        super().showEvent(event)
+        if self._pending_purchases is not None:
+            self.update_chart_data(self._pending_purchases)
+    
+    def set_portfolio_value(self, value: float):
+        """Set the current portfolio value (EUR) used for the portfolio, P/L and wallet lines."""
+        self._current_portfolio_value = value
+    
     def _set_default_chart_options(self):
         """Set default chart options: Auto X/Y axis and Visible Data Only with built-in grid."""
         if not self.plot_widget:
@@ -152,365 +366,217 @@ class ChartWidget(QWidget):
             # Use built-in grid functionality with clean styling
             plot_item.showGrid(x=True, y=True, alpha=0.3)  # Light grid for better readability
             
-            # Verify that options are correctly set
-            auto_x_enabled = view_box.autoRangeEnabled()[0]
-            auto_y_enabled = view_box.autoRangeEnabled()[1]
-            visible_data_x = view_box.autoVisibleOnly[0] if hasattr(view_box, 'autoVisibleOnly') else True
-            visible_data_y = view_box.autoVisibleOnly[1] if hasattr(view_box, 'autoVisibleOnly') else True
-            
-            print(f"Chart options: Auto X: {auto_x_enabled}, Auto Y: {auto_y_enabled}, Grid: enabled")
+            if logger.isEnabledFor(logging.DEBUG):
+                auto_x_enabled, auto_y_enabled = view_box.autoRangeEnabled()[:2]
+                logger.debug("Chart options: Auto X: %s, Auto Y: %s, Grid: enabled", auto_x_enabled, auto_y_enabled)
             
         except Exception as e:
-            print(f"Error setting chart options: {e}")
+            logger.warning("Error setting chart options: %s", e)
     
     def _on_view_range_changed(self, view, ranges):
         """Allow Y-axis to show both positive and negative values for buy/sell bars."""
         try:
             # No longer enforce Y-axis minimum at 0 to allow sell bars (negative values) to be visible
-            # This method can be used for other range validations if needed in the future
-            pass
+            # Re-run LTTB on the visible part of long lines so zooming in recovers detail
+            x_min, x_max = ranges[0]
+            for series in self._line_series:
+                curve, _, x, y, window = series
+                lo = max(int(np.searchsorted(x, x_min, 'left')) - 1, 0)
+                hi = min(int(np.searchsorted(x, x_max, 'right')) + 1, len(x))
+                if (lo, hi) == window:
+                    continue
+                series[4] = (lo, hi)
+                if hi - lo > _LTTB_THRESHOLD:
+                    idx = lo + _lttb_indices(x[lo:hi], y[lo:hi], _LTTB_POINTS)
+                else:
+                    idx = slice(lo, hi)
+                curve.setData(x[idx], y[idx])
+            
+            # Schedule (not force) a repaint so Qt can coalesce it with the rest of the pan/zoom
+            self.plot_widget.viewport().update()
                 
         except Exception as e:
-            print(f"Error in view range change handler: {e}")
+            logger.warning("Error in view range change handler: %s", e)
+    
+    def _set_line(self, curve, name, x=None, y=None):
+        """Give a persistent line new data and legend name, or hide it when there is no data.
+        
+        Series with more points than the view can show are reduced with LTTB; the full data is
+        kept in self._line_series for re-sampling on zoom.
+        """
+        self._line_series = [series for series in self._line_series if series[0] is not curve]
+        self._legend.removeItem(curve)
+        if not x:
+            curve.setData([], [])
+            curve.hide()
+            return
+        
+        if len(x) > _LTTB_THRESHOLD:
+            x = np.asarray(x, dtype=np.float64)
+            y = np.asarray(y, dtype=np.float64)
+            self._line_series.append([curve, name, x, y, (0, len(x))])
+            idx = _lttb_indices(x, y, _LTTB_POINTS)
+            x, y = x[idx], y[idx]
+        curve.setData(x, y)
+        curve.show()
+        self._legend.addItem(curve, name)
     
     def update_chart_data(self, purchases: List[Dict[str, Any]]):
         """Update chart with purchase data, Net P/L line, and purchase bars."""
         if not self.plot_widget:
             return
         
+        # Defer the rebuild until the chart is shown; only the latest data is kept
+        if not self.isVisible():
+            self._pending_purchases = purchases
+            return
+        self._pending_purchases = None
+        
+        # Nothing to redraw if the transaction count, the newest createTime and the portfolio value
+        # are the same as last time (max() rather than an end element: the input order is not assumed)
+        key = (
+            len(purchases),
+            max((p.get('createTime', 0) for p in purchases), default=0),
+            round(self._current_portfolio_value, 2)
+        )
+        if key == self._last_key:
+            return
+        
         try:
-            import pyqtgraph as pg
-            from collections import defaultdict
-            
-            self.clear_chart()
-            
             if not purchases:
+                self.clear_chart()
+                self._last_key = key
                 self.set_chart_title("📈 Investment Timeline - No Data")
                 return
+            self._last_key = key
             
-            # Sort purchases by timestamp
-            purchases_sorted = sorted(purchases, key=lambda x: x.get('createTime', 0))
+            # Sort purchases by timestamp: a stable argsort of the createTime array replaces the
+            # per-item key calls of sorted(), and the sorted timestamps are reused below
+            count = len(purchases)
+            ts = np.fromiter((p.get('createTime', 0) for p in purchases), dtype=np.int64, count=count)
+            order = np.argsort(ts, kind='stable')
+            ts = ts[order]
+            purchases_sorted = [purchases[i] for i in order.tolist()]
             
             # Prepare data for plotting
-            investment_timestamps = []
-            investment_amounts = []
             portfolio_timestamps = []
             portfolio_values = []
-            purchase_bars_x = []
-            purchase_bars_y = []
-            
-            buy_total = 0.0
-            sell_total = 0.0
-            net_investment = 0.0
-            current_portfolio_value = 0.0
-            sell_bars_x = []
-            sell_bars_y = []
-            
-            # Get current portfolio value if available
-            try:
-                from core.config import get_config
-                from core.json_data_manager import JSONDataManager
-                from core.currency import build_eur_price_map, calculate_portfolio_eur_value
-                
-                config = get_config()
-                data_manager = JSONDataManager(config)
-                
-                # Get current balances and calculate portfolio value
-                balances = data_manager.load_balances()
-                if balances:
-                    price_map = build_eur_price_map(balances, config)
-                    current_portfolio_value = calculate_portfolio_eur_value(balances, price_map)
-            except Exception:
-                # If we can't get portfolio value, use investment total as fallback
-                pass
-            
-            # Process ALL transactions (both BUY and SELL)
-            for purchase in purchases_sorted:
-                timestamp = purchase.get('createTime', 0)
-                if timestamp == 0:
-                    continue
-                
-                trans_type = purchase.get('transactionType', '0')
-                fiat_eur = purchase.get('amountFiat', 0)
-                timestamp_sec = timestamp / 1000
-                
-                if trans_type == '0':  # BUY transaction
-                    buy_total += fiat_eur
-                    net_investment += fiat_eur
-                    investment_timestamps.append(timestamp_sec)
-                    investment_amounts.append(net_investment)  # Use net investment instead of buy_total
-                    
-                    # Add purchase bar data
-                    purchase_bars_x.append(timestamp_sec)
-                    purchase_bars_y.append(fiat_eur)
-                    
-                elif trans_type == '1':  # SELL transaction
-                    sell_total += fiat_eur
-                    net_investment -= fiat_eur  # Subtract sells from net investment
-                    investment_timestamps.append(timestamp_sec)
-                    investment_amounts.append(net_investment)  # Update net investment line
-                    
-                    # Add sell bar data (negative for visual distinction)
-                    sell_bars_x.append(timestamp_sec)
-                    sell_bars_y.append(fiat_eur)
+            current_portfolio_value = self._current_portfolio_value
+            
+            # Process ALL transactions (both BUY and SELL) as arrays
+            amt = np.fromiter((p.get('amountFiat', 0) for p in purchases_sorted), dtype=np.float64, count=count)
+            trans_types = [p.get('transactionType', '0') for p in purchases_sorted]
+            is_buy = np.fromiter((t == '0' for t in trans_types), dtype=bool, count=count)
+            is_sell = np.fromiter((t == '1' for t in trans_types), dtype=bool, count=count)
+            has_time = ts != 0
+            buys = is_buy & has_time
+            sells = is_sell & has_time
+            valid = buys | sells
+            
+            # Net investment: buys add, sells subtract, accumulated in time order
+            ts_sec = ts / 1000
+            investment_timestamps = ts_sec[valid].tolist()
+            investment_values = np.cumsum(np.where(is_sell, -amt, amt)[valid])
+            investment_amounts = investment_values.tolist()
             
             # Create portfolio value line (simplified - assuming current value for recent purchases)
             if investment_timestamps and current_portfolio_value > 0:
                 # Create a simple portfolio value line that ends at current value
                 portfolio_timestamps = investment_timestamps.copy()
                 # Linear interpolation from final investment to current portfolio value
-                final_investment = investment_amounts[-1] if investment_amounts else 0
-                for i, inv_amount in enumerate(investment_amounts):
-                    # Simple approximation: scale current portfolio value by investment ratio
-                    ratio = inv_amount / final_investment if final_investment > 0 else 0
-                    portfolio_values.append(ratio * current_portfolio_value)
+                final_investment = investment_amounts[-1]
+                # Simple approximation: scale current portfolio value by investment ratio
+                if final_investment > 0:
+                    portfolio_array = investment_values / final_investment * current_portfolio_value
+                else:
+                    portfolio_array = np.zeros(len(investment_values))
+                portfolio_values = portfolio_array.tolist()
             
             # Plot 1: Portfolio value line over time (BLUE)
-            if portfolio_timestamps and portfolio_values:
-                self.plot_widget.plot(
-                    portfolio_timestamps, portfolio_values,
-                    pen=pg.mkPen(color='#2E86AB', width=3),
-                    name='💼 Portfolio Value'
-                )
+            self._set_line(self._portfolio_curve, '💼 Portfolio Value', portfolio_timestamps, portfolio_values)
             
             # Plot 2: Net investment line (cumulative fiat invested minus sold) - lighter blue for reference
-            if investment_timestamps and investment_amounts:
-                self.plot_widget.plot(
-                    investment_timestamps, investment_amounts,
-                    pen=pg.mkPen(color='#87CEEB', width=2, style=pg.QtCore.Qt.DashLine),
-                    name='📊 Net Investment'
-                )
+            self._set_line(self._net_curve, '📊 Net Investment', investment_timestamps, investment_amounts)
             
             # Plot 2b: NET P/L line (Portfolio Value - Net Investment) - GREEN/RED based on profit/loss
             if portfolio_timestamps and portfolio_values and investment_timestamps and investment_amounts:
-                # Calculate P/L for each timestamp
-                pl_timestamps = []
-                pl_values = []
-                
-                # Align timestamps and calculate P/L
-                for i, timestamp in enumerate(portfolio_timestamps):
-                    if i < len(investment_amounts):
-                        portfolio_value = portfolio_values[i]
-                        net_investment = investment_amounts[i]
-                        pl_value = portfolio_value - net_investment
-                        
-                        pl_timestamps.append(timestamp)
-                        pl_values.append(pl_value)
+                # Calculate P/L for each timestamp (both series share the investment timestamps)
+                pl_timestamps = portfolio_timestamps
+                pl_values = (portfolio_array - investment_values).tolist()
                 
-                if pl_timestamps and pl_values:
-                    # Determine line color based on final P/L
-                    final_pl = pl_values[-1] if pl_values else 0
-                    pl_color = '#27AE60' if final_pl >= 0 else '#E74C3C'  # Green for profit, Red for loss
-                    pl_style = pg.QtCore.Qt.SolidLine if final_pl >= 0 else pg.QtCore.Qt.DashLine
-                    
-                    self.plot_widget.plot(
-                        pl_timestamps, pl_values,
-                        pen=pg.mkPen(color=pl_color, width=2, style=pl_style),
-                        name=f'💰 Net P/L (€{final_pl:.0f})'
-                    )
+                # Determine line color based on final P/L
+                final_pl = pl_values[-1]
+                self._pl_curve.setPen(_PROFIT_PEN if final_pl >= 0 else _LOSS_PEN)  # Green for profit, Red for loss
+                self._set_line(self._pl_curve, f'💰 Net P/L (€{final_pl:.0f})', pl_timestamps, pl_values)
+            else:
+                self._set_line(self._pl_curve, None)
             
             # Plot 3: Current wallet amount (YELLOW horizontal line)
             if current_portfolio_value > 0:
-                current_line = pg.InfiniteLine(
-                    pos=current_portfolio_value, 
-                    angle=0,  # Horizontal line
-                    pen=pg.mkPen(color='#F1C40F', width=4, style=pg.QtCore.Qt.SolidLine),
-                    label='Current Wallet: €{:.0f}'.format(current_portfolio_value),
-                    labelOpts={'position': 0.1, 'color': '#F1C40F', 'fill': '#F1C40F'}
-                )
-                self.plot_widget.addItem(current_line)
-            
-            # Plot 3b: Add prominent horizontal zero line (CRITICAL for buy/sell separation)
-            zero_line = pg.InfiniteLine(
-                pos=0,  # At Y = 0 EUR
-                angle=0,  # Horizontal line
-                pen=pg.mkPen(color='#2C3E50', width=2, style=pg.QtCore.Qt.SolidLine),  # Dark blue-gray, thick line
-                label='€0 (Buy/Sell Separator)',
-                labelOpts={'position': 0.95, 'color': '#2C3E50', 'fill': (44, 62, 80, 100)}
-            )
-            self.plot_widget.addItem(zero_line)
+                self._current_line.setPos(current_portfolio_value)
+                self._current_line.show()
+            else:
+                self._current_line.hide()
+            
+            # Plot 3b: Prominent horizontal zero line (CRITICAL for buy/sell separation)
+            self._zero_line.show()
             
             # Plot 4: Interactive Buy bars (GREEN) and Sell bars (RED)
             # Group transactions by day for both BUY and SELL
-            daily_transactions = defaultdict(lambda: {'buys': [], 'sells': []})
             self.purchase_data = {}  # Clear previous data
-            
-            # Process BUY transactions
-            buy_index = 0
-            for i, purchase in enumerate(purchases_sorted):
-                if purchase.get('transactionType') == '0':  # BUY
-                    if buy_index < len(purchase_bars_x):
-                        timestamp = purchase_bars_x[buy_index]
-                        amount = purchase_bars_y[buy_index]
-                        day_key = int(timestamp // 86400) * 86400  # Round to day
-                        
-                        buy_info = {
-                            'amount': amount,
-                            'timestamp': timestamp,
-                            'original_purchase': purchase,
-                            'date': datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M'),
-                            'type': 'BUY'
-                        }
-                        daily_transactions[day_key]['buys'].append(buy_info)
-                        buy_index += 1
-            
-            # Process SELL transactions  
-            sell_index = 0
-            for i, purchase in enumerate(purchases_sorted):
-                if purchase.get('transactionType') == '1':  # SELL
-                    if sell_index < len(sell_bars_x):
-                        timestamp = sell_bars_x[sell_index]
-                        amount = sell_bars_y[sell_index]
-                        day_key = int(timestamp // 86400) * 86400  # Round to day
-                        
-                        sell_info = {
-                            'amount': amount,
-                            'timestamp': timestamp,
-                            'original_purchase': purchase,
-                            'date': datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M'),
-                            'type': 'SELL'
-                        }
-                        daily_transactions[day_key]['sells'].append(sell_info)
-                        sell_index += 1
-            
-            # Store transaction data and create bars
-            if daily_transactions:
-                # Store transaction data for each day (combining buys and sells)
-                for day_timestamp, day_data in daily_transactions.items():
-                    all_transactions = day_data['buys'] + day_data['sells']
-                    buy_total = sum(t['amount'] for t in day_data['buys'])
-                    sell_total = sum(t['amount'] for t in day_data['sells'])
-                    
-                    self.purchase_data[day_timestamp] = {
-                        'buy_total': buy_total,
-                        'sell_total': sell_total, 
-                        'net_total': buy_total - sell_total,
-                        'transactions': all_transactions,
-                        'count': len(all_transactions),
-                        'buy_count': len(day_data['buys']),
-                        'sell_count': len(day_data['sells'])
-                    }
+            self._purchases_sorted = purchases_sorted
+            
+            # ts is sorted, so each day's buys (and sells) are a contiguous run of indices: np.unique gives
+            # the run starts to split on and the inverse for the per-day totals, all in one vector pass
+            day_keys = (ts // 86400000) * 86400
+            buy_idx = np.nonzero(buys)[0]
+            sell_idx = np.nonzero(sells)[0]
+            buy_days, buy_starts, buy_inverse = np.unique(day_keys[buy_idx], return_index=True, return_inverse=True)
+            sell_days, sell_starts, sell_inverse = np.unique(day_keys[sell_idx], return_index=True, return_inverse=True)
+            buy_totals = np.bincount(buy_inverse, weights=amt[buy_idx], minlength=len(buy_days))
+            sell_totals = np.bincount(sell_inverse, weights=amt[sell_idx], minlength=len(sell_days))
+            buy_groups = dict(zip(buy_days.tolist(), zip(np.split(buy_idx, buy_starts[1:]), buy_totals.tolist())))
+            sell_groups = dict(zip(sell_days.tolist(), zip(np.split(sell_idx, sell_starts[1:]), sell_totals.tolist())))
+            no_transactions = (buy_idx[:0], 0.0)
+            
+            # Store transaction data for each day (combining buys and sells); indices point into purchases_sorted
+            for day_timestamp in np.union1d(buy_days, sell_days).tolist():
+                day_buys, buy_total = buy_groups.get(day_timestamp, no_transactions)
+                day_sells, sell_total = sell_groups.get(day_timestamp, no_transactions)
                 
-                # Create clickable bar class
-                class ClickableBarGraphItem(pg.BarGraphItem):
-                    def __init__(self, *args, **kwargs):
-                        self.chart_widget = kwargs.pop('chart_widget', None)
-                        self.day_timestamp = kwargs.pop('day_timestamp', None)
-                        super().__init__(*args, **kwargs)
-                    
-                    def mouseClickEvent(self, ev):
-                        if ev.button() == pg.QtCore.Qt.LeftButton and self.chart_widget and self.day_timestamp:
-                            print(f"Bar clicked for day: {datetime.fromtimestamp(self.day_timestamp).strftime('%Y-%m-%d')}")
-                            self.chart_widget._on_transaction_clicked(self.day_timestamp)
-                        
-                        # Call parent class method if it exists
-                        if hasattr(pg.BarGraphItem, 'mouseClickEvent'):
-                            pg.BarGraphItem.mouseClickEvent(self, ev)
-                
-                # Create bars for each day with transactions
-                for day_timestamp, day_data in daily_transactions.items():
-                    # Create BUY bars (GREEN, above zero)
-                    if day_data['buys']:
-                        buy_total = sum(t['amount'] for t in day_data['buys'])
-                        buy_bar = ClickableBarGraphItem(
-                            x=[day_timestamp], 
-                            height=[buy_total], 
-                            width=86400,  # 24 hours width
-                            brush=pg.mkBrush(color=(46, 204, 113, 220)),  # Green for buys
-                            pen=pg.mkPen(color='#27AE60', width=2),
-                            chart_widget=self,
-                            day_timestamp=day_timestamp
-                        )
-                        
-                        # Create tooltip for buy bar
-                        buy_tooltip_lines = [
-                            f"📅 {datetime.fromtimestamp(day_timestamp).strftime('%Y-%m-%d')}",
-                            f"💰 Total: €{buy_total:.2f}",
-                            f"📊 {len(day_data['buys'])} purchase(s)",
-                            "",
-                            "🔼 PURCHASES:"
-                        ]
-                        
-                        for transaction in day_data['buys']:
-                            crypto = transaction['original_purchase'].get('cryptoCurrency', 'Unknown')
-                            amount = transaction['amount']
-                            time_str = transaction['date'].split(' ')[1] if ' ' in transaction['date'] else transaction['date']
-                            buy_tooltip_lines.append(f"  • {time_str}: {crypto} - €{amount:.2f} (BUY)")
-                        
-                        buy_bar.setToolTip("\n".join(buy_tooltip_lines))
-                        self.plot_widget.addItem(buy_bar)
-                    
-                    # Create SELL bars (RED, below zero)
-                    if day_data['sells']:
-                        sell_total = sum(t['amount'] for t in day_data['sells'])
-                        sell_bar = ClickableBarGraphItem(
-                            x=[day_timestamp], 
-                            height=[-sell_total],  # Negative height for below-zero bars
-                            width=86400,  # 24 hours width
-                            brush=pg.mkBrush(color=(231, 76, 60, 220)),  # Red for sells
-                            pen=pg.mkPen(color='#C0392B', width=2),
-                            chart_widget=self,
-                            day_timestamp=day_timestamp
-                        )
-                        
-                        # Create tooltip for sell bar
-                        sell_tooltip_lines = [
-                            f"📅 {datetime.fromtimestamp(day_timestamp).strftime('%Y-%m-%d')}",
-                            f"💰 Total Sold: €{sell_total:.2f}",
-                            f"📊 {len(day_data['sells'])} sale(s)",
-                            "",
-                            "🔻 SALES:"
-                        ]
-                        
-                        for transaction in day_data['sells']:
-                            crypto = transaction['original_purchase'].get('cryptoCurrency', 'Unknown')
-                            amount = transaction['amount']
-                            time_str = transaction['date'].split(' ')[1] if ' ' in transaction['date'] else transaction['date']
-                            sell_tooltip_lines.append(f"  • {time_str}: {crypto} - €{amount:.2f} (SELL)")
-                        
-                        sell_bar.setToolTip("\n".join(sell_tooltip_lines))
-                        self.plot_widget.addItem(sell_bar)
-            
-                # Add legend and configure proper zoom level
+                self.purchase_data[day_timestamp] = {
+                    'buy_total': buy_total,
+                    'sell_total': sell_total, 
+                    'net_total': buy_total - sell_total,
+                    'buys': day_buys,
+                    'sells': day_sells,
+                    'count': len(day_buys) + len(day_sells),
+                    'buy_count': len(day_buys),
+                    'sell_count': len(day_sells)
+                }
+            
+            # Update bars
+            for bars, days, heights in ((self._buy_bars, buy_days, buy_totals),
+                                        (self._sell_bars, sell_days, -sell_totals)):  # Negative height for below-zero bars
+                bars.setOpts(x=days, height=heights)
+                bars.day_timestamps = days.tolist()
+                bars._hover_day = None
+                bars.setVisible(len(days) > 0)
+            
+            # Show the legend and configure proper zoom level
+            self._legend.setVisible(bool(investment_timestamps))
             if investment_timestamps:
-                # Create and configure a prominent legend
-                legend = self.plot_widget.addLegend()
-                legend.setParentItem(self.plot_widget.getPlotItem())
-                
-                # Style the legend for better visibility
-                try:
-                    # Set legend properties for better visibility
-                    legend.setBrush(pg.mkBrush(color=(255, 255, 255, 200)))  # White background with transparency
-                    legend.setPen(pg.mkPen(color=(0, 0, 0), width=1))  # Black border
-                    legend.setOffset((10, 10))  # Position offset from top-left
-                    
-                    # Try to set text style if supported
-                    if hasattr(legend, 'setLabelTextColor'):
-                        legend.setLabelTextColor((0, 0, 0))  # Black text
-                    
-                    print("✅ Legend styled successfully")
-                    
-                except Exception as e:
-                    print(f"⚠️ Legend styling failed: {e}")
-                
-                print("✅ Legend added to chart")
-                
                 # Configure proper view range with padding for axis labels
                 view_box = self.plot_widget.getViewBox()
                 
-                # Calculate data bounds including sell bars (negative values)
-                min_timestamp = min(investment_timestamps)
-                max_timestamp = max(investment_timestamps)
-                min_value = min(investment_amounts) if investment_amounts else 0
-                max_value = max(investment_amounts) if investment_amounts else 1000
+                # Calculate data bounds including sell bars (negative values); timestamps are sorted
+                min_timestamp = investment_timestamps[0]
+                max_timestamp = investment_timestamps[-1]
+                min_value = float(investment_values.min())
+                max_value = float(investment_values.max())
                 
                 # Consider sell bar values for Y-axis range (they go below zero)
-                max_sell_amount = 0
-                if daily_transactions:
-                    for day_data in daily_transactions.values():
-                        if day_data['sells']:
-                            sell_amount = sum(t['amount'] for t in day_data['sells'])
-                            max_sell_amount = max(max_sell_amount, sell_amount)
+                max_sell_amount = float(sell_totals.max()) if len(sell_totals) else 0
                 
                 # Add padding for better visibility and axis labels
                 time_range = max_timestamp - min_timestamp
@@ -569,9 +635,59 @@ class ChartWidget(QWidget):
             self._set_default_chart_options()
         
         except Exception as e:
-            print(f"Error updating chart: {e}")
+            logger.error("Error updating chart: %s", e)
+            self._last_key = None  # Retry on the next update
             self.set_chart_title(f"📈 Chart Error: {str(e)}")
     
+    def _bar_tooltip(self, day_timestamp, trans_type: str) -> str:
+        """Build the hover tooltip of one day's buy or sell bar."""
+        transaction_info = self.purchase_data.get(day_timestamp)
+        if not transaction_info:
+            return ""
+        
+        if trans_type == 'BUY':
+            tooltip_lines = [
+                f"📅 {_fmt_day(day_timestamp)}",
+                f"💰 Total: €{transaction_info['buy_total']:.2f}",
+                f"📊 {transaction_info['buy_count']} purchase(s)",
+                "",
+                "🔼 PURCHASES:"
+            ]
+        else:
+            tooltip_lines = [
+                f"📅 {_fmt_day(day_timestamp)}",
+                f"💰 Total Sold: €{transaction_info['sell_total']:.2f}",
+                f"📊 {transaction_info['sell_count']} sale(s)",
+                "",
+                "🔻 SALES:"
+            ]
+        
+        for purchase, _ in self._day_transactions(transaction_info, trans_type):
+            crypto = purchase.get('cryptoCurrency', 'Unknown')
+            amount = purchase.get('amountFiat', 0)
+            time_str = _fmt_minute(purchase.get('createTime', 0) / 1000).split(' ', 1)[-1]
+            tooltip_lines.append(f"  • {time_str}: {crypto} - €{amount:.2f} ({trans_type})")
+        
+        return "\n".join(tooltip_lines)
+    
+    def _day_transactions(self, transaction_info, trans_type: str = None):
+        """Resolve a day's stored indices to (purchase, 'BUY'/'SELL') pairs, buys first.
+        
+        Args:
+            transaction_info: Entry of self.purchase_data
+            trans_type: 'BUY' or 'SELL' to return only one side
+            
+        Returns:
+            List of (purchase dict, transaction type) tuples
+        """
+        purchases = self._purchases_sorted
+        transactions = []
+        if trans_type != 'SELL':
+            transactions.extend((purchases[i], 'BUY') for i in transaction_info['buys'])
+        if trans_type != 'BUY':
+            transactions.extend((purchases[i], 'SELL') for i in transaction_info['sells'])
+        return transactions
+    
     def _on_transaction_clicked(self, day_timestamp):
         """Handle click events on transaction bars (both buy and sell) to highlight in table."""
         try:
@@ -579,47 +695,42 @@ class ChartWidget(QWidget):
                 return
             
             transaction_info = self.purchase_data[day_timestamp]
-            all_transactions = transaction_info['transactions']
-            
-            # Create tooltip info for both buys and sells
-            tooltip_lines = [
-                f"📅 Date: {datetime.fromtimestamp(day_timestamp).strftime('%Y-%m-%d')}"
-            ]
-            
-            # Add buy info if any
-            if transaction_info['buy_count'] > 0:
-                tooltip_lines.extend([
-                    f"🔼 Total Purchases: €{transaction_info['buy_total']:.2f}",
-                    f"📊 {transaction_info['buy_count']} purchase(s)"
-                ])
-            
-            # Add sell info if any
-            if transaction_info['sell_count'] > 0:
-                tooltip_lines.extend([
-                    f"🔻 Total Sales: €{transaction_info['sell_total']:.2f}",
-                    f"📊 {transaction_info['sell_count']} sale(s)"
-                ])
-            
-            # Add net info
+            all_transactions = self._day_transactions(transaction_info)
+            date_str = _fmt_day(day_timestamp)
             net_total = transaction_info['net_total']
-            net_type = "profit" if net_total > 0 else "loss" if net_total < 0 else "neutral"
-            tooltip_lines.append(f"💵 Net: €{net_total:.2f} ({net_type})")
-            
-            tooltip_lines.extend(["", "Transactions on this day:"])
             
-            # Add individual transaction details
-            for transaction in all_transactions:
-                crypto = transaction['original_purchase'].get('cryptoCurrency', 'Unknown')
-                amount = transaction['amount']
-                trans_type = transaction['type']
-                time_str = transaction['date'].split(' ')[1] if ' ' in transaction['date'] else transaction['date']
+            # Click summary for the debug log, only built when it will be emitted
+            if logger.isEnabledFor(logging.DEBUG):
+                # Create tooltip info for both buys and sells
+                tooltip_lines = [
+                    f"📅 Date: {date_str}"
+                ]
                 
-                arrow = "↑" if trans_type == 'BUY' else "↓"
-                tooltip_lines.append(f"  {arrow} {time_str}: {crypto} - €{amount:.2f} ({trans_type})")
-            
-            tooltip_text = "\n".join(tooltip_lines)
-            
-            print(f"Transaction clicked: {tooltip_text}")
+                # Add buy info if any
+                if transaction_info['buy_count'] > 0:
+                    tooltip_lines.append(f"🔼 Total Purchases: €{transaction_info['buy_total']:.2f}")
+                    tooltip_lines.append(f"📊 {transaction_info['buy_count']} purchase(s)")
+                
+                # Add sell info if any
+                if transaction_info['sell_count'] > 0:
+                    tooltip_lines.append(f"🔻 Total Sales: €{transaction_info['sell_total']:.2f}")
+                    tooltip_lines.append(f"📊 {transaction_info['sell_count']} sale(s)")
+                
+                # Add net info
+                net_type = "profit" if net_total > 0 else "loss" if net_total < 0 else "neutral"
+                tooltip_lines.append(f"💵 Net: €{net_total:.2f} ({net_type})")
+                
+                tooltip_lines.append("")
+                tooltip_lines.append("Transactions on this day:")
+                
+                # Add individual transaction details
+                for purchase, trans_type in all_transactions:
+                    tooltip_lines.append(
+                        f"  {_ARROWS.get(trans_type, '?')} {_fmt_minute(purchase.get('createTime', 0) / 1000).split(' ', 1)[-1]}: "
+                        f"{purchase.get('cryptoCurrency', 'Unknown')} - €{purchase.get('amountFiat', 0):.2f} ({trans_type})"
+                    )
+                
+                logger.debug("Transaction clicked: %s", "\n".join(tooltip_lines))
             
             # Try to highlight transactions in the table
             highlighted_count = self._highlight_transactions_in_table(all_transactions)
@@ -627,9 +738,9 @@ class ChartWidget(QWidget):
             # Show tooltip info in chart title temporarily with feedback
             original_title = self.title_label.text() if self.title_label else ""
             if highlighted_count > 0:
-                temp_title = f"✅ {datetime.fromtimestamp(day_timestamp).strftime('%Y-%m-%d')}: {highlighted_count} transactions highlighted in table"
+                temp_title = f"✅ {date_str}: {highlighted_count} transactions highlighted in table"
             else:
-                temp_title = f"📅 {datetime.fromtimestamp(day_timestamp).strftime('%Y-%m-%d')}: {transaction_info['count']} transactions, Net: €{net_total:.0f}"
+                temp_title = f"📅 {date_str}: {transaction_info['count']} transactions, Net: €{net_total:.0f}"
             self.set_chart_title(temp_title)
             
             # Reset title after 4 seconds
@@ -637,7 +748,7 @@ class ChartWidget(QWidget):
             QTimer.singleShot(4000, lambda: self.set_chart_title(original_title))
             
         except Exception as e:
-            print(f"Error handling transaction click: {e}")
+            logger.error("Error handling transaction click: %s", e)
     
     def _on_purchase_clicked(self, day_timestamp, points):
         """Handle click events on purchase bars to highlight in table (legacy method)."""
@@ -648,80 +759,97 @@ class ChartWidget(QWidget):
         """Highlight the clicked transactions (both buys and sells) in the main table and return count of highlighted rows."""
         highlighted_count = 0
         try:
-            # Navigate to the main window and highlight table rows
-            main_window = self.main_window
-            while main_window and not hasattr(main_window, 'purchases_table'):
-                main_window = getattr(main_window, 'parent', lambda: None)()
-            
-            if not main_window or not hasattr(main_window, 'purchases_table'):
-                print("Could not find main window or purchases table")
-                return highlighted_count
+            # Use the cached main window; walk up the parents only on first use or once it is gone
+            main_window = self._table_window_ref() if self._table_window_ref is not None else None
+            if main_window is None:
+                main_window = self.main_window
+                while main_window and not hasattr(main_window, 'purchases_table'):
+                    main_window = getattr(main_window, 'parent', lambda: None)()
+                
+                if not main_window or not hasattr(main_window, 'purchases_table'):
+                    logger.warning("Could not find main window or purchases table")
+                    return highlighted_count
+                self._table_window_ref = weakref.ref(main_window)
             
             purchases_table = main_window.purchases_table
             
-            # Switch to the Purchases tab if the main window has tab_widget
-            if hasattr(main_window, 'tab_widget'):
-                # Find the Purchases tab and switch to it
-                tab_widget = main_window.tab_widget
-                for tab_index in range(tab_widget.count()):
-                    if tab_widget.tabText(tab_index) == "Purchases":
-                        tab_widget.setCurrentIndex(tab_index)
-                        print("Switched to Purchases tab")
-                        break
-            
-            # Clear previous selection
-            purchases_table.clearSelection()
-            
-            # Find and select matching rows
-            for transaction in transactions:
-                original_transaction = transaction['original_purchase']
-                transaction_timestamp = original_transaction.get('createTime', 0)
-                trans_type = transaction['type']
+            # Suppress repaints, re-sorting and signals until the tab switch and selection are done
+            sorting_enabled = purchases_table.isSortingEnabled()
+            purchases_table.setUpdatesEnabled(False)
+            purchases_table.setSortingEnabled(False)
+            purchases_table.blockSignals(True)
+            first_index = None
+            try:
+                # Switch to the Purchases tab if the main window has tab_widget
+                if hasattr(main_window, 'tab_widget'):
+                    # Find the Purchases tab and switch to it
+                    tab_widget = main_window.tab_widget
+                    for tab_index in range(tab_widget.count()):
+                        if tab_widget.tabText(tab_index) == "Purchases":
+                            tab_widget.setCurrentIndex(tab_index)
+                            logger.debug("Switched to Purchases tab")
+                            break
+                
+                # Index the model's typed columns: order ID + type, and crypto + amount in cents + type as a fallback
+                model = purchases_table.model()
+                order_index = {}
+                fallback_index = {}
+                amount_cents = np.rint(model.amounts * 100).astype(np.int64).tolist()
+                for row, (table_order_id, table_crypto, table_cents, table_type) in enumerate(
+                        zip(model.order_ids, model.cryptos, amount_cents, model.types)):
+                    if table_order_id:
+                        order_index.setdefault((table_order_id, table_type), row)
+                    fallback_index.setdefault((table_crypto, table_cents, table_type), row)
+                
+                # Find matching rows; everything below depends only on the transaction, never on a row
+                matched_rows = []
+                find_by_order = order_index.get
+                find_by_fallback = fallback_index.get
+                for original_transaction, trans_type in transactions:
+                    transaction_order_id = str(original_transaction.get('orderId', '')).strip()
+                    transaction_crypto = original_transaction.get('cryptoCurrency', '').strip()
+                    transaction_amount = original_transaction.get('amountFiat', 0)
+                    
+                    # Match transaction type (BUY/SELL)
+                    expected_type = "BUY" if trans_type == 'BUY' else "SELL"
+                    
+                    # Primary match: Order ID + Type (most reliable)
+                    # Secondary match: Crypto + Amount + Type (for edge cases)
+                    row = find_by_order((transaction_order_id, expected_type)) if transaction_order_id else None
+                    match_type = "OrderID+Type"
+                    if row is None:
+                        expected_cents = int(round(transaction_amount * 100))
+                        row = find_by_fallback((transaction_crypto, expected_cents, expected_type))
+                        match_type = "Crypto+Amount+Type"
+                    
+                    if row is not None:
+                        matched_rows.append(row)
+                        logger.debug("Highlighted %s (%s): %s - €%.2f (OrderID: %s)", trans_type, match_type,
+                                     transaction_crypto, transaction_amount, transaction_order_id)
+                        highlighted_count += 1
+                
+                # Replace the previous selection with all matched rows in one select() call
+                last_column = model.columnCount() - 1
+                selection = QItemSelection()
+                for row in matched_rows:
+                    selection.select(model.index(row, 0), model.index(row, last_column))
                 
-                # Search through table rows to find matching transactions
-                # Table columns: Date(0), Type(1), OrderID(2), FiatCurrency(3), FiatAmount(4), Crypto(5), CryptoAmount(6), Price(7), Fee(8)
-                for row in range(purchases_table.rowCount()):
-                    try:
-                        # Get transaction details for matching
-                        order_id_item = purchases_table.item(row, 2)  # Order ID in column 2
-                        crypto_item = purchases_table.item(row, 5)    # Crypto in column 5
-                        amount_item = purchases_table.item(row, 4)    # Fiat amount in column 4
-                        type_item = purchases_table.item(row, 1)      # Type in column 1
-                        
-                        if order_id_item and crypto_item and amount_item and type_item:
-                            table_order_id = order_id_item.text().strip()
-                            table_crypto = crypto_item.text().strip()
-                            table_amount = float(amount_item.text().replace('€', '').replace(',', '').strip())
-                            table_type = type_item.text().strip()
-                            
-                            transaction_order_id = str(original_transaction.get('orderId', '')).strip()
-                            transaction_crypto = original_transaction.get('cryptoCurrency', '').strip()
-                            transaction_amount = original_transaction.get('amountFiat', 0)
-                            
-                            # Match transaction type (BUY/SELL)
-                            expected_type = "BUY" if trans_type == 'BUY' else "SELL"
-                            type_match = table_type == expected_type
-                            
-                            # Primary match: Order ID + Type (most reliable)
-                            # Secondary match: Crypto + Amount + Type (for edge cases)
-                            order_id_match = (table_order_id and transaction_order_id and 
-                                            table_order_id == transaction_order_id and type_match)
-                            crypto_amount_match = (table_crypto == transaction_crypto and 
-                                                 abs(table_amount - transaction_amount) < 0.01 and type_match)
-                            
-                            if order_id_match or crypto_amount_match:
-                                # Highlight this row
-                                purchases_table.selectRow(row)
-                                purchases_table.scrollToItem(purchases_table.item(row, 0))
-                                match_type = "OrderID+Type" if order_id_match else "Crypto+Amount+Type"
-                                print(f"Highlighted {trans_type} ({match_type}): {transaction_crypto} - €{transaction_amount:.2f} (OrderID: {transaction_order_id})")
-                                highlighted_count += 1
-                                break
-                    except (ValueError, AttributeError) as e:
-                        continue  # Skip problematic rows
+                purchases_table.selectionModel().select(
+                    selection, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+                if matched_rows:
+                    first_index = model.index(matched_rows[0], 0)
+            finally:
+                purchases_table.blockSignals(False)
+                purchases_table.setSortingEnabled(sorting_enabled)
+                purchases_table.setUpdatesEnabled(True)
+            
+            # Scroll once, after sorting is restored, then repaint once
+            if first_index is not None:
+                purchases_table.scrollTo(first_index)
+            purchases_table.viewport().update()
             
         except Exception as e:
-            print(f"Error highlighting transactions in table: {e}")
+            logger.error("Error highlighting transactions in table: %s", e)
         
         return highlighted_count
     
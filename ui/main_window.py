@@ -5,11 +5,11 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QToolBar, QPushButton, QLabel, QTabWidget, QTableWidget, QTableWidgetItem,
+    QToolBar, QPushButton, QLabel, QTabWidget, QTableWidget, QTableWidgetItem, QTableView,
     QProgressBar, QTextEdit, QFrame, QSplitter, QMessageBox, QFileDialog, QDialog,
     QApplication, QSizePolicy, QHeaderView
 )
-from PySide6.QtCore import Qt, QThread, Signal, QTimer
+from PySide6.QtCore import Qt, QThread, Signal, QTimer, QItemSelection, QItemSelectionModel
 from PySide6.QtGui import QFont, QPixmap, QIcon, QPalette
 import pyqtgraph as pg
 
@@ -19,6 +19,7 @@ from core.currency import build_eur_price_map, calculate_portfolio_eur_value
 from api.binance_client import BinanceAPIClient
 from api.fiat import FiatOrdersFetcher
 from .settings_dialog import SettingsDialog
+from .purchases_model import PurchasesTableModel
 
 
 class FetchWorker(QThread):
@@ -343,13 +344,16 @@ class MainWindow(QMainWindow):
         # Start in maximized mode for optimal screen usage
         self.showMaximized()
         
-        # Migrate existing purchase data to fix zero amounts
+        # Move purchases from a legacy purchases.json into the purchases.jsonl log
         try:
             migrated_count = self.data_manager.migrate_purchase_data()
             if migrated_count > 0:
-                print(f"Migrated {migrated_count} purchase records with correct amounts")
+                self.log_message(
+                    f"Moved {migrated_count} purchase records from purchases.json to purchases.jsonl "
+                    f"(old file kept as purchases.json.bak)", "SUCCESS"
+                )
         except Exception as e:
-            print(f"Error during data migration: {e}")
+            self.log_message(f"Error migrating purchases.json: {e}", "ERROR")
         
         self.load_data()
         
@@ -648,7 +652,9 @@ class MainWindow(QMainWindow):
         self.tab_widget = QTabWidget()
         
         # Purchases tab
-        self.purchases_table = QTableWidget()
+        self.purchases_model = PurchasesTableModel(self)
+        self.purchases_table = QTableView()
+        self.purchases_table.setModel(self.purchases_model)
         self.tab_widget.addTab(self.purchases_table, "Purchases")
         
         # Balances tab
@@ -968,61 +974,14 @@ class MainWindow(QMainWindow):
         """Load purchases into table."""
         purchases = self.data_manager.get_purchases(limit=1000)  # Limit for performance
         
-        self.purchases_table.setColumnCount(9)
-        self.purchases_table.setHorizontalHeaderLabels([
-            "Date", "Type", "Order ID", "Fiat Currency", "Fiat Amount", 
-            "Crypto", "Crypto Amount", "Price", "Fee"
-        ])
-        
-        self.purchases_table.setRowCount(len(purchases))
+        self.purchases_model.set_purchases(purchases)
         
-        for row, purchase in enumerate(purchases):
-            # Format timestamp - use createTime from JSON data
-            timestamp = purchase.get('createTime', 0)
-            if timestamp:
-                date_str = datetime.fromtimestamp(timestamp / 1000).strftime('%Y-%m-%d %H:%M')
-            else:
-                date_str = ""
-            
-            # Determine transaction type - use transactionType directly from JSON
-            trans_type = 'BUY'  # Default
-            transaction_type_code = purchase.get('transactionType', '0')
-            if transaction_type_code == '1':
-                trans_type = 'SELL'
-            else:
-                trans_type = 'BUY'
-            
-            self.purchases_table.setItem(row, 0, QTableWidgetItem(date_str))
-            
-            # Add transaction type with color coding
-            type_item = QTableWidgetItem(trans_type)
-            if trans_type == 'BUY':
-                from PySide6.QtGui import QColor
-                type_item.setBackground(QColor(0, 255, 0, 50))  # Light green
-            else:
-                from PySide6.QtGui import QColor
-                type_item.setBackground(QColor(255, 0, 0, 50))  # Light red
-            self.purchases_table.setItem(row, 1, type_item)
-            
-            self.purchases_table.setItem(row, 2, QTableWidgetItem(str(purchase.get('orderId', ''))))
-            self.purchases_table.setItem(row, 3, QTableWidgetItem(purchase.get('fiatCurrency', '')))
-            self.purchases_table.setItem(row, 4, QTableWidgetItem(f"{purchase.get('amountFiat', 0):.2f}"))
-            self.purchases_table.setItem(row, 5, QTableWidgetItem(purchase.get('cryptoCurrency', '')))
-            self.purchases_table.setItem(row, 6, QTableWidgetItem(f"{purchase.get('amountCrypto', 0):.6f}"))
-            self.purchases_table.setItem(row, 7, QTableWidgetItem(f"{purchase.get('price', 0):.6f}"))
-            self.purchases_table.setItem(row, 8, QTableWidgetItem(f"{purchase.get('fee', 0):.2f}"))
-        
-        # Set proper column sizing for purchases table - all resize to contents to prevent truncation
+        # Size columns to their contents once per load, from a sample of rows, and leave them user-resizable;
+        # ResizeToContents would re-read every cell of the model on each layout pass
         header = self.purchases_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # Date
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)  # Type
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # Order ID
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Fiat Currency
-        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # Fiat Amount
-        header.setSectionResizeMode(5, QHeaderView.ResizeToContents)  # Crypto
-        header.setSectionResizeMode(6, QHeaderView.ResizeToContents)  # Crypto Amount
-        header.setSectionResizeMode(7, QHeaderView.ResizeToContents)  # Price
-        header.setSectionResizeMode(8, QHeaderView.ResizeToContents)  # Fee
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setResizeContentsPrecision(100)  # Rows sampled per column when sizing
+        self.purchases_table.resizeColumnsToContents()
         
         # Enable horizontal scrolling when content is wider than table
         self.purchases_table.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
@@ -1133,6 +1092,10 @@ class MainWindow(QMainWindow):
                 total_balances = {asset: info['free'] + info['locked'] for asset, info in balances.items()}
                 current_value = calculate_portfolio_eur_value(total_balances, eur_price_map)
             
+            # Hand the value to the chart so it does not reload balances on every redraw
+            if getattr(self, 'chart_impl', None):
+                self.chart_impl.set_portfolio_value(current_value)
+            
             # Calculate P/L based on net investment
             net_pl = current_value - net_invested
             net_pl_percent = (net_pl / net_invested * 100) if net_invested > 0 else 0
@@ -1747,30 +1710,29 @@ class MainWindow(QMainWindow):
                 if order_id:
                     selected_order_ids.add(order_id)
             
-            # Clear existing selection
-            self.purchases_table.clearSelection()
-            
-            # Find and select matching rows
+            # Find matching rows from the model's order ID column
+            model = self.purchases_model
+            last_column = model.columnCount() - 1
+            selection = QItemSelection()
             highlighted_count = 0
-            for row in range(self.purchases_table.rowCount()):
-                # Order ID is in column 2
-                order_id_item = self.purchases_table.item(row, 2)
-                if order_id_item:
-                    order_id = order_id_item.text()
-                    if order_id in selected_order_ids:
-                        # Select the entire row
-                        self.purchases_table.selectRow(row)
-                        highlighted_count += 1
+            first_row = None
+            for row, order_id in enumerate(model.order_ids):
+                if order_id in selected_order_ids:
+                    selection.select(model.index(row, 0), model.index(row, last_column))
+                    highlighted_count += 1
+                    if first_row is None:
+                        first_row = row
+            
+            # Replace the existing selection with all matched rows in one select() call
+            self.purchases_table.selectionModel().select(
+                selection, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
             
             if highlighted_count > 0:
                 # Scroll to first selected row
-                selected_ranges = self.purchases_table.selectionModel().selectedRows()
-                if selected_ranges:
-                    first_row = selected_ranges[0].row()
-                    self.purchases_table.scrollToItem(
-                        self.purchases_table.item(first_row, 0), 
-                        self.purchases_table.PositionAtCenter
-                    )
+                self.purchases_table.scrollTo(
+                    model.index(first_row, 0),
+                    QTableView.PositionAtCenter
+                )
                 
                 self.statusBar().showMessage(
                     f"Highlighted {highlighted_count} transactions in table", 
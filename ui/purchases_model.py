@@ -0,0 +1,104 @@
+"""Table model for the Purchases tab, storing transactions as typed columns."""
+import functools
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+
+HEADERS = [
+    "Date", "Type", "Order ID", "Fiat Currency", "Fiat Amount",
+    "Crypto", "Crypto Amount", "Price", "Fee"
+]
+
+# Type column background: light green for buys, light red for sells
+_TYPE_COLORS = {'BUY': QColor(0, 255, 0, 50), 'SELL': QColor(255, 0, 0, 50)}
+
+
+@functools.lru_cache(maxsize=2048)
+def _fmt_create_time(timestamp_ms: int) -> str:
+    """Local date and time (to the minute) of a createTime in milliseconds, or '' when missing."""
+    if not timestamp_ms:
+        return ""
+    return datetime.fromtimestamp(timestamp_ms / 1000).strftime('%Y-%m-%d %H:%M')
+
+
+class PurchasesTableModel(QAbstractTableModel):
+    """Purchases as parallel per-column lists and arrays; cell text is built on demand in data().
+    
+    Rows keep the order of the list given to set_purchases. The columns (order_ids, types, cryptos,
+    amounts, ...) are public so callers can search them without going through the view.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.create_times: List[int] = []
+        self.types: List[str] = []
+        self.order_ids: List[str] = []
+        self.fiat_currencies: List[str] = []
+        self.amounts = np.zeros(0)
+        self.cryptos: List[str] = []
+        self.crypto_amounts = np.zeros(0)
+        self.prices = np.zeros(0)
+        self.fees = np.zeros(0)
+    
+    def set_purchases(self, purchases: List[Dict[str, Any]]):
+        """Replace all rows with the given transactions.
+        
+        Args:
+            purchases: Transaction dicts as returned by JSONDataManager.get_purchases()
+        """
+        count = len(purchases)
+        self.beginResetModel()
+        self.create_times = [p.get('createTime', 0) for p in purchases]
+        self.types = ['SELL' if p.get('transactionType', '0') == '1' else 'BUY' for p in purchases]
+        self.order_ids = [str(p.get('orderId', '')) for p in purchases]
+        self.fiat_currencies = [p.get('fiatCurrency', '') for p in purchases]
+        self.amounts = np.fromiter((p.get('amountFiat', 0) for p in purchases), dtype=np.float64, count=count)
+        self.cryptos = [p.get('cryptoCurrency', '') for p in purchases]
+        self.crypto_amounts = np.fromiter((p.get('amountCrypto', 0) for p in purchases), dtype=np.float64, count=count)
+        self.prices = np.fromiter((p.get('price', 0) for p in purchases), dtype=np.float64, count=count)
+        self.fees = np.fromiter((p.get('fee', 0) for p in purchases), dtype=np.float64, count=count)
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.types)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+        
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return _fmt_create_time(self.create_times[row])
+            if column == 1:
+                return self.types[row]
+            if column == 2:
+                return self.order_ids[row]
+            if column == 3:
+                return self.fiat_currencies[row]
+            if column == 4:
+                return f"{self.amounts[row]:.2f}"
+            if column == 5:
+                return self.cryptos[row]
+            if column == 6:
+                return f"{self.crypto_amounts[row]:.6f}"
+            if column == 7:
+                return f"{self.prices[row]:.6f}"
+            if column == 8:
+                return f"{self.fees[row]:.2f}"
+        elif role == Qt.BackgroundRole and column == 1:
+            return _TYPE_COLORS.get(self.types[row])
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
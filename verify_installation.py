@@ -23,9 +23,7 @@ def test_dependencies():
     dependencies = {
         'httpx': 'HTTP client for API requests',
         'PySide6': 'Qt GUI framework',
-        'pydantic': 'Data validation',
         'dotenv': 'Environment file handling',
-        'tenacity': 'Retry logic for API calls',
         'dateutil': 'Date parsing utilities',
         'pyqtgraph': 'Chart and graph widgets',
         'numpy': 'Numerical computations for charts'